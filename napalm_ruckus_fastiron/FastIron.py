@@ -18,28 +18,68 @@ from __future__ import unicode_literals
 
 # std libs
 # import sys
-from netmiko import ConnectHandler
 import socket
 import sys
+import threading
+import time
 # import re
 
 # local modules
 # import napalm.base.exceptions
 # import napalm.base.helpers
 from napalm.base.exceptions import ReplaceConfigException, \
-    MergeConfigException, ConnectionException, ConnectionClosedException
+    MergeConfigException, ConnectionException, ConnectionClosedException, \
+    CommandTimeoutException
 
 # import napalm.base.constants as c
 # from napalm.base import validate
 from napalm.base import NetworkDriver
 
+from napalm_ruckus_fastiron.utils.cache import CommandCache, normalize_command
+from napalm_ruckus_fastiron.utils.channel import CommandProfile, ShellChannel, \
+    assign_commands, count_prompts, iter_stream_lines, prompt_pattern, shell_pattern, \
+    split_by_prompt
+from napalm_ruckus_fastiron.utils.config import compare_configs, replace_commands
+from napalm_ruckus_fastiron.utils.facts_cache import FactsCache
+from napalm_ruckus_fastiron.utils.interfaces import iter_interface_brief, \
+    iter_interface_counters, parse_duration, parse_interface_details
+from napalm_ruckus_fastiron.utils.lines import iter_nlines, list_of_nlines
+from napalm_ruckus_fastiron.utils.lldp import parse_lldp_neighbors
+from napalm_ruckus_fastiron.utils.metrics import Instrumentation
+from napalm_ruckus_fastiron.utils.parsers import first, parse
+from napalm_ruckus_fastiron.utils.platform import parse_platform
+from napalm_ruckus_fastiron.utils.tables import iter_arp_entries, iter_mac_entries, normalize_mac
+from napalm_ruckus_fastiron.utils.tokens import TokenizedOutput
+
 
 class FastIronDriver(NetworkDriver):
     """Napalm driver for FastIron."""
 
-    def __init__(self, hostname, username, password, timeout=60, **optional_args):
+    # show commands sent by the getters called without arguments, used by get_many()
+    GETTER_COMMANDS = {
+        'get_facts': ['show version', 'show interface brief', 'show running | i hostname'],
+        'get_interfaces': ['show interface brief', 'show interface'],
+        'get_interfaces_counters': ['show interface'],
+        'get_environment': ['show chassis', 'show cpu', 'show memory', 'show inline power'],
+        'get_lldp_neighbors': ['show lldp neighbors'],
+        'get_lldp_neighbors_detail': ['show lldp neighbors detail'],
+        'get_arp_table': ['show arp'],
+        'get_mac_address_table': ['show mac-address all'],
+        'get_ntp_peers': ['show ntp associations'],
+        'get_ntp_servers': ['show ntp associations'],
+        'get_ntp_stats': ['show ntp associations'],
+        'get_interfaces_ip': ['show version', 'show ip interface', 'show ipv6 interface'],
+        'get_users': ['show users'],
+        'get_config': ['show running-config', 'show config'],
+        'get_network_instances': ['show version', 'show vrf detail'],
+    }
+
+    def __init__(self, hostname, username, password, timeout=60, optional_args=None):
         """Constructor."""
 
+        if optional_args is None:
+            optional_args = {}
+
         self.device = None
         self.hostname = hostname
         self.username = username
@@ -54,6 +94,23 @@ class FastIronDriver(NetworkDriver):
         self.rollback_cfg = optional_args.get('rollback_cfg', 'rollback_config.txt')
         self.use_secret = optional_args.get('use_secret', False)
         self.image_type = None
+        self._platform = None                           # probed once per session
+        self._ntp = None                                # (output, rows) of the last NTP parse
+        self.keepalive = optional_args.get('keepalive', 0)
+        self.alive_threshold = optional_args.get('alive_threshold', 0)
+        self._last_success = 0.0                        # time of the last command answered
+        self._cache = CommandCache(optional_args.get('cache_ttl', 0))
+        facts_cache = optional_args.get('facts_cache')
+        self._facts_cache = FactsCache(facts_cache) if facts_cache else None
+        self._facts_checked = False                     # facts_cache entry validated this session
+        self.read_strategy = optional_args.get('read_strategy', 'netmiko')
+        self.channels = optional_args.get('channels', 1)
+        self._shells = list()                           # channels opened past the first one
+        self._profile = CommandProfile(optional_args.get('large_output', 65536))
+        self._metrics = Instrumentation(optional_args.get('instrumentation', False),
+                                        optional_args.get('metrics_hook'))
+        if self._metrics.enabled:
+            self._metrics.instrument(self)              # wraps every get_* method
 
     def __del__(self):
         """
@@ -67,6 +124,8 @@ class FastIronDriver(NetworkDriver):
         """
         Opens a connection to the device.
         """
+        from netmiko import ConnectHandler             # loads the SSH stack on first open()
+
         try:
             if self.use_secret:
                 secret = self.password
@@ -80,13 +139,13 @@ class FastIronDriver(NetworkDriver):
                                          password=self.password,
                                          timeout=self.timeout,
                                          secret=secret,
-                                         verbose=True)
-            self.device.session_preparation()
-            # image_type = self.device.send_command("show version")   # find the image type
-            # if image_type.find("SPS") != -1:
-            #     self.image_type = "Switch"
-            # else:
-            #     self.image_type = "Router"
+                                         keepalive=self.keepalive,
+                                         verbose=True)   # prepares the session itself
+            self._platform = None
+            self._facts_checked = False
+            if self.channels > 1:
+                self.__open_shells(self.channels - 1)
+            self._last_success = time.time()
 
         except Exception:
             raise ConnectionException("Cannot connect to switch: %s:%s" % (self.hostname,
@@ -96,7 +155,15 @@ class FastIronDriver(NetworkDriver):
         """
         Closes the connection to the device.
         """
-        self.device.disconnect()
+        self._platform = None
+        self._ntp = None
+        self._facts_checked = False
+        self._last_success = 0.0
+        for shell in self._shells:
+            shell.close()
+        self._shells = list()
+        if self.device is not None:                     # never opened
+            self.device.disconnect()
 
     def is_alive(self):
         """
@@ -106,341 +173,537 @@ class FastIronDriver(NetworkDriver):
         consideration other parameters, e.g.: NETCONF session might not be usable, although the
         underlying SSH session is still open etc.
         """
+        try:                                # a closed transport or channel needs no probe
+            transport = self.device.remote_conn.transport
+            if not transport.is_active() or self.device.remote_conn.closed:
+                return {'is_alive': False}
+        except AttributeError:
+            return {'is_alive': False}
+
+        if self.alive_threshold and time.time() - self._last_success < self.alive_threshold:
+            return {'is_alive': True}       # a command was answered recently
+
         null = chr(0)
         try:                                # send null byte see if alive
             self.device.send_command(null)
-            return {'is_alive': self.device.remote_conn.transport.is_active()}
-
         except (socket.error, EOFError):
             return {'is_alive': False}
-        except AttributeError:
-            return {'is_alive': False}
+        self._last_success = time.time()
+        return {'is_alive': transport.is_active()}
+
+    @property
+    def platform(self):
+        """Model, image type, version, stack size and VRF support of the device.
+
+        Probed from show version the first time it is needed in a session.
+        """
+        if self._platform is None and self.__cached_facts() is None:
+            self.__set_platform(self._send_command('show version'))
+        return self._platform
+
+    def __release(self):
+        """Returns the release of the device if it is already known, to pick parser templates."""
+        return self._platform['version'] if self._platform is not None else ()
+
+    def __set_platform(self, show_version):
+        self._platform = parse_platform(show_version)
+        self.image_type = self._platform['image_type']
+
+    def __facts_key(self):
+        return self.hostname if self.port == 22 else '%s:%s' % (self.hostname, self.port)
+
+    def __cached_facts(self):
+        """Returns the facts kept in the facts_cache for the device, None if missing or stale.
+
+        Only the uptime and release of the device are read to validate the entry, once per
+        session. An entry stored before a reload or an upgrade is dropped. The platform is
+        taken from a valid entry.
+        """
+        if self._facts_cache is None:
+            return None
+        entry = self._facts_cache.get(self.__facts_key())
+        if entry is None:
+            return None
+
+        now = time.time()
+        if not self._facts_checked:
+            uptime_output, version_output = self._send_commands([
+                'show version | include uptime', 'show version | include SW:'])
+            uptime = first('show version', 'uptime', uptime_output)
+            os_version = parse_platform(version_output)['os_version']
+            if uptime is None or not self._facts_cache.is_current(
+                    entry, now - parse_duration(uptime['uptime'].split()), os_version):
+                self._facts_cache.invalidate(self.__facts_key())
+                return None
+            self._facts_checked = True
+
+        if self._platform is None:
+            self._platform = entry['platform']
+            self.image_type = self._platform['image_type']
+        return dict(entry['facts'], uptime=int(now - entry['boot']))
+
+    def __config_changed(self):
+        """Drops the cached outputs and facts made stale by a configuration change."""
+        self._cache.invalidate()
+        if self._facts_cache is not None:               # the hostname may have changed
+            self._facts_cache.invalidate(self.__facts_key())
+            self._facts_checked = False
 
     def _send_command(self, command):
         """Wrapper for self.device.send.command().
 
         If command is a list will iterate through commands until valid command.
+        Outputs are served from the session cache when it is enabled.
         """
         output = ""
 
         try:
             if isinstance(command, list):
                 for cmd in command:
-                    output = self.device.send_command(cmd)
-                    if "% Invalid" not in output:
+                    output = self.__cached_send(cmd)
+                    if "Invalid input" not in output:
                         break
             else:
-                output = self.device.send_command(command)
+                output = self.__cached_send(command)
             return output
         except (socket.error, EOFError) as e:
             raise ConnectionClosedException(str(e))
 
-    class PortSpeedException(Exception):
-        """Raised when port speed does not match available inputs"""
-
-        def __init_(self, arg):
-            print("unexpected speed: %s please submit bug with port speed" % arg)
-            sys.exit(1)
-
-    @staticmethod
-    def __retrieve_all_locations(long_string, word, pos):
-        """Finds a word of a long_string and returns the value in the nth position"""
-        count = 0                           # counter
-        split_string = long_string.split()  # breaks long string into string of substring
-        values = []                         # creates a list
-        for m in split_string:              # goes through substrings one by one
-            count += 1                      # increments counter
-            if m == word:                   # if substring and word match then specific value
-                values.append(split_string[count + pos])    # is added to list that is returned
-        return values
-
-    @staticmethod
-    def __find_words(output, word_list, pos_list):
-        """   """
-        dictionary = {}
-        if len(word_list) != len(pos_list):             # checks word, pos pair exist
-            return None
-
-        if len(word_list) == 0 or len(pos_list) == 0:   # returns NONE if list is empty
-            return None
-
-        size = len(word_list)
-        sentence = output.split()                   # breaks long string into separate strings
+    def __cached_send(self, command):
+        start = time.time()
+        wait = 0.0
+        output = self._cache.get(command)
+        if output is None:                              # not cached or expired
+            output = self.__device_send(command)
+            wait = time.time() - start
+            self._cache.put(command, output)
+        if self._metrics.enabled:
+            self._metrics.record_command(command, time.time() - start, wait, output)
+        return output
+
+    def _send_commands(self, commands, use_cache=True):
+        """Sends a list of show commands in a single round trip.
+
+        Returns the outputs in the same order as commands. Cached outputs are not sent again and
+        devices without a raw channel get the commands one at a time.
+        """
+        start = time.time()
+        outputs, pending = self.__cached_outputs(commands, use_cache)
+        if not pending:
+            return outputs
+
+        received = self.__send_pending([commands[index] for index in pending])
+        for index, output in zip(pending, received):
+            outputs[index] = output
+            if use_cache:
+                self._cache.put(commands[index], output)
+
+        if self._metrics.enabled:                       # a batch wait is shared by its commands
+            wait = (time.time() - start) / len(pending)
+            for index, cmd in enumerate(commands):
+                elapsed = wait if index in pending else 0.0
+                self._metrics.record_command(cmd, elapsed, elapsed, outputs[index])
+        return outputs
+
+    def __cached_outputs(self, commands, use_cache):
+        """Returns the cached output of every command, None if not cached, and the index of the
+        commands to send."""
+        outputs = [None] * len(commands)
+        pending = list()
+        for index, cmd in enumerate(commands):
+            output = self._cache.get(cmd) if use_cache else None
+            if output is None:
+                pending.append(index)
+            else:
+                outputs[index] = output
+        return outputs, pending
 
-        for m in range(0, size):                    # Iterates through size of word list
-            pos = int(pos_list.pop())               # pops element position and word pair in list
-            word = word_list.pop()
-            if word in sentence:                    # checks if word is contained in text
-                indx = sentence.index(word)         # records the index of word
-                dictionary[word] = sentence[indx + pos]
+    def __send_pending(self, commands):
+        """Sends commands over the extra channels, as a batch or one at a time."""
+        try:
+            if len(commands) > 1 and self._shells:
+                return self.__parallel_send(commands)
+            if len(commands) > 1 and hasattr(self.device, 'write_channel'):
+                return self.__batch_send(commands)
+            return [self.__device_send(cmd) for cmd in commands]
+        except (socket.error, EOFError) as e:
+            raise ConnectionClosedException(str(e))
 
-        return dictionary
+    def __device_send(self, command):
+        """Sends a single command to the device and records how long the output took."""
+        start = time.time()
+        if self.read_strategy in ('prompt', 'stream') and hasattr(self.device, 'write_channel'):
+            output = self.__prompt_send([command])[0]
+        else:
+            output = self.device.send_command(command)
+        self._last_success = time.time()
+        self._profile.record(command, self._last_success - start, len(output))
+        return output
 
-    @staticmethod
-    def __creates_list_of_nlines(my_string):
-        """ Breaks a long string into separated substring"""
-        temp = ""                       # sets empty string, will add char respectively
-        my_list = list()                # creates list
-        for val in range(0, len(my_string)):    # iterates through the length of input
+    def __batch_send(self, commands, device=None):
+        """Writes all commands to the channel and reads until the prompt of the last one.
 
-            if my_string[val] == '\n' and temp == "":
-                continue
-            elif my_string[val] == '\n' or val == len(my_string) - 1:    # add what was found
-                my_list.append(temp)
-                temp = ""
-            else:
-                temp += my_string[val]
+        Commands of a batch are recorded with the elapsed time of the whole batch.
+        """
+        start = time.time()
+        outputs = self.__prompt_send(commands, device)
+        self._last_success = time.time()
+        elapsed = self._last_success - start
+        for cmd, output in zip(commands, outputs):
+            self._profile.record(cmd, elapsed, len(output))
+        return outputs
+
+    def __parallel_send(self, commands):
+        """Sends commands over the session and the additional shells at the same time.
+
+        Commands are spread over the channels by their expected time, each channel getting its
+        share as a single batch, so a slow command does not hold up the others.
+        """
+        devices = [self.device] + self._shells
+        costs = [self._profile.cost(cmd) for cmd in commands]
+        groups = assign_commands(commands, costs, len(devices))
+        outputs = [None] * len(commands)
+        errors = list()
 
-        return my_list
+        def send(device, group):
+            try:
+                received = self.__batch_send([commands[index] for index in group], device)
+                for index, output in zip(group, received):
+                    outputs[index] = output
+            except Exception as e:                      # raised again by the calling thread
+                errors.append(e)
+
+        threads = [threading.Thread(target=send, args=(device, group))
+                   for device, group in zip(devices[1:], groups[1:]) if group]
+        for thread in threads:
+            thread.start()
+        if groups[0]:
+            send(devices[0], groups[0])
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        return outputs
+
+    def __open_shells(self, count):
+        """Opens up to count additional shells on the SSH transport of the session.
+
+        Stops at the first shell refused or failing to reach the privileged mode, devices that
+        limit their sessions are used with the channels opened so far.
+        """
+        from paramiko import SSHException
 
-    @staticmethod
-    def __delete_if_contains(nline_list, del_word):
-        temp_list = list()                          # Creates a list to store variables
-        for a_string in nline_list:                 # iterates through list
-            if del_word in a_string:                # if word matches, word is skipped
-                continue
+        transport = self.device.remote_conn.transport
+        for __ in range(count):
+            channel = None
+            try:
+                channel = transport.open_session()
+                channel.get_pty(width=511, height=1000)
+                channel.invoke_shell()
+                shell = ShellChannel(channel, self.device)
+                self.__prepare_shell(shell)
+            except (SSHException, socket.error, EOFError, ValueError, CommandTimeoutException):
+                if channel is not None:
+                    channel.close()
+                return
+            self._shells.append(shell)
+
+    def __prepare_shell(self, shell):
+        """Enters the privileged mode of a new shell and disables paging, like netmiko does."""
+        pattern = shell_pattern(shell.base_prompt)
+        match = self.__read_until(shell, pattern)
+        if match.group('mode') == '>':
+            shell.write_channel('enable' + shell.RETURN)
+            match = self.__read_until(shell, pattern)
+            for __ in range(2):                         # user name and/or enable password
+                if match.group('login') is None:
+                    break
+                answer = self.username if 'ame' in match.group('login') else \
+                    (self.password if self.use_secret else '')
+                shell.write_channel(answer + shell.RETURN)
+                match = self.__read_until(shell, pattern)
+        if match.group('mode') != '#':
+            raise ValueError('Enable mode refused on an additional channel')
+        self.__prompt_send(['skip-page-display'], shell)
+
+    def __read_until(self, shell, pattern):
+        """Reads shell until its output ends with pattern and returns the match."""
+        output = ''
+        interval = 0.001
+        deadline = time.time() + self.timeout
+        while True:
+            chunk = shell.read_channel()
+            if chunk:
+                output += chunk
+                match = pattern.search(output.replace('\r', ''))
+                if match:
+                    return match
+                interval = 0.001
+            elif time.time() > deadline:
+                raise CommandTimeoutException("Timed out opening an additional channel")
             else:
-                temp_list.append(a_string.split())  # Word didn't match store in list
-        return temp_list
+                time.sleep(interval)
+                interval = min(interval * 2, 0.05)
 
-    @staticmethod
-    def __facts_uptime(my_string):  # TODO check for hours its missing....
-        my_list = ["day(s)", "hour(s)", "minute(s)", "second(s)"]   # list of words to find
-        my_pos = [-1, -1, -1, -1]                   # relative position of interest
-        total_seconds = 0                           # data variables
-        multiplier = 0
-        t_dictionary = FastIronDriver.__find_words(my_string, my_list, my_pos)    # retrieves pos
-
-        for m in t_dictionary.keys():               # Checks word found and its multiplier
-            if m == "second(s)":                    # converts to seconds
-                multiplier = 1
-            elif m == "minute(s)":
-                multiplier = 60
-            elif m == "hour(s)":
-                multiplier = 3600
-            elif m == "day(s)":
-                multiplier = 86400
-            total_seconds = int(t_dictionary.get(m))*multiplier + total_seconds
-        return total_seconds
+    def __prompt_send(self, commands, device=None):
+        """Writes commands to the channel and returns as soon as the prompt of the last is read.
 
-    @staticmethod
-    def __facts_model(string):
-        model = FastIronDriver.__retrieve_all_locations(string, "Stackable", 0)[0]
-        return model                                # returns the model of the switch
+        The channel is polled with a short, growing interval instead of netmiko's fixed delays.
+        The device may stay silent for the driver timeout, extended for commands known to be
+        large. On a timeout the rest of the outputs is drained up to the last prompt, so that the
+        next command does not read it.
+        """
+        device = device or self.device
+        pattern = prompt_pattern(device.base_prompt)
+        timeouts = [self._profile.read_timeout(cmd, self.timeout) for cmd in commands]
+        device.clear_buffer()
+        device.write_channel(device.RETURN.join(commands) + device.RETURN)
 
-    @staticmethod
-    def __facts_hostname(string):
-        if "hostname" in string:
-            hostname = FastIronDriver.__retrieve_all_locations(string, "hostname", 0)[0]
-            return hostname                         # returns the hostname if configured
-        else:
-            return None
+        output, found = FastIronDriver.__read_prompts(device, pattern, timeouts)
+        if found < len(commands):
+            FastIronDriver.__read_prompts(device, pattern, timeouts[found:])
+            device.clear_buffer()
+            raise CommandTimeoutException("Timed out waiting for: %s" % commands[found])
 
-    @staticmethod
-    def __facts_os_version(string):
-        os_version = FastIronDriver.__retrieve_all_locations(string, "SW:", 1)[0]
-        return os_version                           # returns the os_version of switch
+        output = device.normalize_linefeeds(device.strip_ansi_escape_codes(output))
+        return split_by_prompt(output, commands, pattern)
 
     @staticmethod
-    def __facts_serial(string):
-        serial = FastIronDriver.__retrieve_all_locations(string, "Serial", 0)[0]
-        serial = serial.replace('#:', '')
-        return serial                               # returns serial number
+    def __read_prompts(device, pattern, timeouts):
+        """Reads the channel until a prompt is found for every timeout, or the device is silent
+        for longer than the timeout of the awaited prompt. Returns the output and prompt count.
+        """
+        output = ""
+        found, pos = 0, 0
+        interval = 0.001
+        deadline = time.time() + timeouts[0]
+        while found < len(timeouts):
+            chunk = device.read_channel()
+            if not chunk:
+                if time.time() > deadline:
+                    break
+                time.sleep(interval)
+                interval = min(interval * 2, 0.05)      # backs off while the device is silent
+                continue
+            interval = 0.001
+            scan = max(pos, output.rfind('\n') + 1)     # only the last line can hold a new prompt
+            output += chunk
+            count, pos = count_prompts(pattern, output, scan)
+            found += count
+            if found < len(timeouts):
+                deadline = time.time() + timeouts[found]    # the device is still sending
+        return output, found
 
     @staticmethod
-    def __physical_interface_list(shw_int_brief, only_physical=True):
-        interface_list = list()
-        n_line_output = FastIronDriver.__creates_list_of_nlines(shw_int_brief)
+    def __narrowed(narrowed, command):
+        """Returns the narrowed form of command followed by command, sent if it is rejected"""
+        return command if narrowed is None else [narrowed, command]
 
-        for line in n_line_output:
-            line_list = line.split()
-            if only_physical == 1:
-                interface_list.append(line_list[0])
-        return interface_list
+    def _streaming(self):
+        """True when outputs are parsed while they are read, outputs are cached otherwise."""
+        return self.read_strategy == 'stream' and not self._cache.enabled and \
+            hasattr(self.device, 'write_channel')
 
-    @staticmethod
-    def __facts_interface_list(shw_int_brief, pos=0, del_word="Port", trigger=0):
-        interfaces_list = list()
-        n_line_output = FastIronDriver.__creates_list_of_nlines(shw_int_brief)
+    def _send_command_lines(self, command):
+        """Yields the non-empty output lines of command, like _send_command() for a list.
 
-        interface_details = FastIronDriver.__delete_if_contains(n_line_output, del_word)
-
-        for port_det in interface_details:
+        With the 'stream' read strategy lines are yielded while the rest of the output is still
+        read from the channel, so parsing overlaps the transfer and the whole output is never
+        held in memory. Otherwise the output is read in full first.
+        """
+        if not self._streaming():
+            for line in iter_nlines(self._send_command(command)):
+                yield line
+            return
 
-            if trigger == 0:
-                interfaces_list.append(port_det[pos])
-            else:                                           # removes non physical interface
-                if any(x in port_det[pos] for x in ["ve", "lb", "tunnel"]):
+        commands = command if isinstance(command, list) else [command]
+        try:
+            for pos, cmd in enumerate(commands):
+                lines = self.__stream_send(cmd)
+                first_line = next(lines, None)
+                if first_line is not None and "Invalid input" in first_line and \
+                        pos < len(commands) - 1:
+                    lines.close()                       # reads up to the prompt, tries the next
                     continue
-                else:
-                    interfaces_list.append(port_det[pos])       # adds phys interface to list
-        return interfaces_list
-
-    @staticmethod
-    def __port_time(shw_int_port):
-        t_port = list()                                         # Creates n lines of show int port
-        new_lines = FastIronDriver.__creates_list_of_nlines(shw_int_port)
+                try:
+                    if first_line is not None:
+                        yield first_line
+                    for line in lines:
+                        yield line
+                finally:
+                    lines.close()                       # drains the output if the caller stopped
+                return
+        except (socket.error, EOFError) as e:
+            raise ConnectionClosedException(str(e))
 
-        for val in new_lines:
-            if "name" in val:
+    def __stream_send(self, command):
+        """Writes command to the channel and yields its non-empty output lines as they arrive."""
+        device = self.device
+        start = time.time()
+        received = [0, 0]                               # bytes and lines of the output
+        device.clear_buffer()
+        device.write_channel(command + device.RETURN)
+        lines = iter_stream_lines(self.__read_chunks(command, received),
+                                  prompt_pattern(device.base_prompt))
+        try:
+            for line in lines:
+                if '\x1b' in line:
+                    line = device.strip_ansi_escape_codes(line)
+                if line:
+                    received[1] += 1
+                    yield line
+        except GeneratorExit:                           # the caller stopped early, the rest of
+            for __ in lines:                            # the output must not reach next command
+                pass
+            self._last_success = time.time()
+            raise
+        finally:
+            elapsed = time.time() - start
+            self._profile.record(command, elapsed, received[0])
+            if self._metrics.enabled:
+                self._metrics.record(command, elapsed, elapsed, received[0], received[1])
+        self._last_success = time.time()
+
+    def __read_chunks(self, command, received):
+        """Yields what is read from the channel until the device is silent for too long."""
+        device = self.device
+        timeout = self._profile.read_timeout(command, self.timeout)
+        interval = 0.001
+        deadline = time.time() + timeout
+        while True:
+            chunk = device.read_channel()
+            if not chunk:
+                if time.time() > deadline:
+                    raise CommandTimeoutException("Timed out waiting for: %s" % command)
+                time.sleep(interval)
+                interval = min(interval * 2, 0.05)      # backs off while the device is silent
                 continue
-            t_port.append(FastIronDriver.__facts_uptime(val))     # adds time to ports
-
-        return t_port
+            interval = 0.001
+            deadline = time.time() + timeout            # the device is still sending
+            received[0] += len(chunk)
+            yield chunk
 
-    @staticmethod
-    def __get_interface_speed(shw_int_speed):
-        speed = list()                                          # creates list
-        for val in shw_int_speed:                               # speed words contained and compared
-            if val == 'auto,' or val == '1Gbit,':               # appends speed hat
-                speed.append(1000)
-            elif val == '10Mbit,':
-                speed.append(10)
-            elif val == '100Mbit,':
-                speed.append(100)
-            elif val == '2.5Gbit,':
-                speed.append(2500)
-            elif val == '5Gbit,':
-                speed.append(5000)
-            elif val == '10Gbit,':
-                speed.append(10000)
-            elif val == '40Gbit,':
-                speed.append(40000)
-            elif val == '100Gbit,':
-                speed.append(100000)
-            else:
-                raise FastIronDriver.PortSpeedException(val)
+    def command_timings(self):
+        """Returns the count, mean, last and max time and largest output of every command."""
+        return self._profile.timings()
 
-        return speed
+    def metrics(self):
+        """Returns the time, device wait, bytes and lines of every command and getter.
 
-    @staticmethod
-    def __unite_strings(output):
-        """ removes all the new line and excess spacing in a string"""
-        my_string = ""                              # empty string
-
-        for index in range(len(output)):            # iterates through all characters of output
+        Only recorded when the driver is opened with the instrumentation optional argument.
+        """
+        return self._metrics.metrics()
 
-            if output[index] != '\n' and output[index] != ' ':  # skips newline and spaces
-                my_string += output[index]
+    def cache_stats(self):
+        """Returns the hit and miss counters of the command output cache."""
+        return self._cache.stats()
 
-            if index != len(output) - 1:
-                if output[index] == ' ' and output[index+1] != ' ':
-                    my_string += ' '                # next char of string is not another space
+    def clear_cache(self):
+        """Drops every cached command output."""
+        self._cache.invalidate()
 
-        return my_string                            # returns stored string
+    def get_many(self, getter_names):
+        """Runs several getters over a single execution of the commands they share.
 
-    @staticmethod
-    def __get_interface_name(shw_int_name, size):
-        port_status = list()                            # Creates list
-        shw_int_name = FastIronDriver.__creates_list_of_nlines(shw_int_name)
-        for val in shw_int_name:                        # iterates through n lines
-            if "No port name" in val:
-                port_status.append("")                  # appends nothing for port name
-            else:
-                port_status.append(val.replace("Port name is", ""))     # Removes fluff add name
+        The commands of every getter are collected from GETTER_COMMANDS, sent once in a single
+        round trip, and the getters then parse the shared outputs. Getters are called without
+        arguments, those without a known plan send their commands themselves. Returns a
+        dictionary of getter name -> result.
+        """
+        for name in getter_names:
+            if not name.startswith('get_') or name == 'get_many' or \
+                    not callable(getattr(self, name, None)):
+                raise ValueError('Unknown getter "{}"'.format(name))
+
+        plan, planned = list(), set()
+        for name in getter_names:
+            for command in self.GETTER_COMMANDS.get(name, ()):
+                if normalize_command(command) not in planned:     # each command is sent once
+                    planned.add(normalize_command(command))
+                    plan.append(command)
+
+        session_cache = self._cache
+        if not session_cache.enabled:               # outputs are only kept for this call
+            self._cache = CommandCache(float('inf'))
+        try:
+            if plan:
+                self._send_commands(plan)
+            return dict((name, getattr(self, name)()) for name in getter_names)
+        finally:
+            self._cache = session_cache
 
-        for temp in range(0, size - len(port_status)):  # adds no names to the remainder so that
-            port_status.append("")                      # all matrix of data are the same size
+    class PortSpeedException(Exception):
+        """Raised when port speed does not match available inputs"""
 
-        return port_status
+        def __init_(self, arg):
+            print("unexpected speed: %s please submit bug with port speed" % arg)
+            sys.exit(1)
 
     @staticmethod
-    def __is_greater(value, threshold):               # compares two values returns true if value
-        if float(value) >= float(threshold):        # is greater or equal to threshold
-            return True
-        return False
+    def __retrieve_all_locations(long_string, word, pos):
+        """Finds a word of a long_string and returns the value in the nth position"""
+        tokens = TokenizedOutput.of(long_string)        # accepts raw or already split output
+        return tokens.values_at(word, pos + 1)
 
     @staticmethod
-    def __get_interfaces_speed(shw_int_speed, size):
-        port_status = list()                            # Create a list
-        for val in range(0, size):
-            if val < len(shw_int_speed):
-                port_status.append(shw_int_speed[val])  # appends string index into port list
-            else:
-                port_status.append(0)
-        return port_status                              # returns port list
+    def __facts_hostname(string):
+        tokens = TokenizedOutput.of(string)
+        if "hostname" in tokens:
+            hostname = FastIronDriver.__retrieve_all_locations(tokens, "hostname", 0)[0]
+            return hostname                         # returns the hostname if configured
+        else:
+            return None
 
     @staticmethod
-    def __matrix_format(my_input):
-        my_list = list()
-        newline = FastIronDriver.__creates_list_of_nlines(my_input)
-        for text in newline:                            # Goes through n lines by n lines
-            text = text.split()                         # splits long string into words
-            if len(text) < 1:                           # if more than a single word skip
-                continue
-            else:
-                my_list.append(text)                    # appends single word
-
-        return my_list                                  # returns list
+    def __environment_fan(chassis):
+        if parse('show chassis', 'fanless', chassis):
+            return {"fan": {None}}                      # no fans are in unit and returns None
+        return {'fan': dict(('fan' + fan['fan'], {'status': fan['status'] == 'ok'})
+                            for fan in parse('show chassis', 'fan', chassis))}
 
     @staticmethod
-    def __environment_temperature(string):
+    def __environment_temperature(chassis):
         dic = dict()
-        temp = FastIronDriver.__retrieve_all_locations(string, "(Sensor", -3)
-        warning = FastIronDriver.__retrieve_all_locations(string, "Warning", 1)
-        shutdown = FastIronDriver.__retrieve_all_locations(string, "Shutdown", 1)
-        for val in range(0, len(temp)):
-            crit = FastIronDriver.__is_greater(temp[val], shutdown[0])
-            alert = FastIronDriver.__is_greater(temp[val], warning[0])
-            dic.update({'sensor ' + str(val + 1): {'temperature': float(temp[val]),
-                                                   'is_alert': alert,
-                                                   'is_critical': crit}})
-
-        return {'temperature': dic}                     # returns temperature of type dictionary
-
-    @staticmethod
-    def __environment_cpu(string):
-        cpu = max(FastIronDriver.__retrieve_all_locations(string, "percent", -2))
-        dic = {'%usage': cpu}
-        return {'cpu': dic}                             # returns dictionary with key cpu
+        warning = first('show chassis', 'warning', chassis)
+        shutdown = first('show chassis', 'shutdown', chassis)
+        for pos, sensor in enumerate(parse('show chassis', 'temperature', chassis)):
+            temperature = sensor['temperature']
+            dic['sensor ' + str(pos + 1)] = {   # sensors are numbered again on every unit
+                'temperature': temperature,
+                'is_alert': warning is not None and temperature >= warning['level'],
+                'is_critical': shutdown is not None and temperature >= shutdown['level'],
+            }
+        return {'temperature': dic}
 
     @staticmethod
-    def __environment_power(chassis_string, inline_string):
-        status = FastIronDriver.__retrieve_all_locations(chassis_string, "Power", 4)
-        potential_values = FastIronDriver.__retrieve_all_locations(chassis_string, "Power", 1)
-        norm_stat = FastIronDriver.__retrieve_all_locations(chassis_string, "Power", 7)
-        capacity = float(FastIronDriver.__retrieve_all_locations(inline_string,
-                                                                 "Free", -4)[0]) / 1000
-        pwr_used = capacity - float(FastIronDriver.__retrieve_all_locations(inline_string,
-                                                                            "Free", 1)[0]) / 1000
-
-        my_dic = {}  # creates new list
-        for val in range(0, len(status)):               # if power supply has failed will return
-            if status[val] == 'failed':                 # false, if working will return true
-                my_dic["PSU" + potential_values[val]] = {'status': False,
-                                                         'capacity': 0.0,
-                                                         'output': 0.0}
-            elif norm_stat[val] == "ok":
-                my_dic["PS" + potential_values[val]] = {'status': True,
-                                                        'capacity': capacity,
-                                                        'output': pwr_used}
-
-        return {'power': my_dic}                        # returns dictionary containing pwr info
+    def __environment_power(chassis, inline):
+        capacity = output = 0.0                         # no inline power on non PoE models
+        power = first('show inline power', 'capacity', inline)
+        if power is not None:
+            capacity = power['total'] / 1000.0
+            output = capacity - power['free'] / 1000.0
+
+        my_dic = dict()
+        for supply in parse('show chassis', 'power_supply', chassis):
+            if 'failed' in supply['state']:            # a failed supply has no capacity
+                my_dic['PSU' + supply['psu']] = {'status': False, 'capacity': 0.0, 'output': 0.0}
+            elif 'status ok' in supply['state']:
+                my_dic['PS' + supply['psu']] = {'status': True, 'capacity': capacity,
+                                                'output': output}
+        return {'power': my_dic}
 
     @staticmethod
-    def __environment_fan(string):
-        fan = FastIronDriver.__retrieve_all_locations(string, "Fan", 1)
-        unit = FastIronDriver.__retrieve_all_locations(string, "Fan", 0)
-        my_dict = {}  # creates list
-
-        if "Fanless" in string:
-            return {"fan": {None}}                      # no fans are in unit and returns None
-
-        for val in range(0, len(fan)):
-            if fan[val] == "ok,":                       # checks if output is failed or ok
-                my_dict["fan" + unit[val]] = {'status': True}
-            elif fan[val] == "failed":                  # if fan fails, will return false
-                my_dict["fan" + unit[val]] = {'status': False}
-
-        return {'fan': my_dict}                         # returns dictionary containing fan info
+    def __environment_cpu(cpu):
+        busy = [record['percent'] for record in parse('show cpu', 'busy', cpu)]
+        return {'cpu': {'%usage': max(busy) if busy else 0.0}}
 
     @staticmethod
-    def __environment_memory(string):
-        mem_total = FastIronDriver.__retrieve_all_locations(string, "Dynamic", 1)
-        mem_used = FastIronDriver.__retrieve_all_locations(string, "Dynamic", 4)
-        dic = {'available_ram': int(mem_total[0]), 'used_ram': int(mem_used[0])}
-
-        return {'memory': dic}
+    def __environment_memory(memory):
+        dynamic = first('show memory', 'dynamic', memory)   # memory of the active unit
+        if dynamic is None:
+            return {'memory': {'available_ram': -1, 'used_ram': -1}}
+        return {'memory': {'available_ram': dynamic['total'],
+                           'used_ram': dynamic['total'] - dynamic['free']}}
 
     @staticmethod
     def __output_parser(output, word):
@@ -449,7 +712,7 @@ class FastIronDriver(NetworkDriver):
         token = output.find(word) + len(word)           # saves pos of where word is contained
         count = 0                                       # counter variable
         output = output[token:len(output)].replace('/', ' ')
-        nline = FastIronDriver.__creates_list_of_nlines(output)
+        nline = iter_nlines(output)
         ip6_dict = dict()                               # creates dictionary
 
         for sentence in nline:                          # separated n lines goes n line by n line
@@ -469,93 +732,6 @@ class FastIronDriver(NetworkDriver):
 
         return ip6_dict                                 # returns ipv6 dictionary
 
-    @staticmethod
-    def __creates_config_block(list_1):
-        config_block = list()
-        temp_block = list()
-
-        for line_cmd in list_1:
-            cmd_position = list_1.index(line_cmd)
-            if cmd_position != 0:
-                if list_1[cmd_position - 1] == '!':
-                    while list_1[cmd_position] != '!' and cmd_position < len(list_1) - 1:
-                        temp_block.append(list_1[cmd_position])
-                        cmd_position += 1
-
-                    if len(temp_block) > 0:
-                        config_block.append(temp_block)
-                    temp_block = list()
-
-        return config_block
-
-    @staticmethod
-    def __compare_blocks(cb_1, config_blocks_2, cmd, symbol):
-        temp_list = list()
-        for cb_2 in config_blocks_2:                # grabs a single config block
-            if cmd == cb_2[0]:                      # checks cmd not found
-                stat = True
-                for single_cmd in cb_1:             # iterates through cmd of config block
-                    if single_cmd == cmd:           # if this is first command add as base
-                        temp_list.append(single_cmd)  # add to list with no changes
-                    elif single_cmd not in cb_2:
-                        temp_list.append(symbol + " " + single_cmd)
-        return temp_list, stat
-
-    @staticmethod
-    def __comparing_list(list_1, list_2, symbol):
-        diff_list = list()
-        config_blocks_1 = FastIronDriver.__creates_config_block(list_1)
-        config_blocks_2 = FastIronDriver.__creates_config_block(list_2)
-
-        for cb_1 in config_blocks_1:                # Grabs a single config block
-            is_found = False
-
-            if cb_1 not in config_blocks_2:         # checks if config block already exisit
-                cmd = cb_1[0]                       # grabs first cmd of config block
-
-                temp_list, is_found = FastIronDriver.__compare_blocks(cb_1, config_blocks_2,
-                                                                      cmd, symbol)
-
-                if is_found == 0:
-                    for value in cb_1:
-                        temp_list.append(symbol + " " + value)
-
-            if len(temp_list) > 1:
-                diff_list.append(temp_list)
-
-        return diff_list
-
-    @staticmethod
-    def __compare_away(diff_1, diff_2):
-        mystring = ""
-
-        for cb_1 in diff_1:
-            mystring += cb_1[0] + '\n'
-            for cb_2 in diff_2:
-                if cb_1[0] in cb_2:
-                    for value_2 in range(1, len(cb_2)):
-                        mystring += cb_2[value_2] + '\n'
-            for input_1 in range(1, len(cb_1)):
-                mystring += cb_1[input_1] + '\n'
-
-        return mystring
-
-    @staticmethod
-    def __compare_vice(diff_2, diff_1):
-        mystring = ""
-
-        for cb_2 in diff_2:
-            found = False
-            for cb_1 in diff_1:
-                if cb_2[0] in cb_1:
-                    found = True
-
-            if found == 0:
-                for input_2 in cb_2:
-                    mystring += input_2 + '\n'
-
-        return mystring
-
     def load_replace_candidate(self, filename=None, config=None):
         """
         Populates the candidate configuration. You can populate it from a file or from a string.
@@ -580,7 +756,7 @@ class FastIronDriver(NetworkDriver):
             try:
                 file_content = open(filename, "r")          # attempts to open file
                 temp = file_content.read()                  # stores file content
-                self.config_replace = FastIronDriver.__creates_list_of_nlines(temp)
+                self.config_replace = list_of_nlines(temp)
                 self.replace_config = True                  # file opened successfully
                 return
             except ValueError:
@@ -588,7 +764,7 @@ class FastIronDriver(NetworkDriver):
 
         if config is not None:
             try:
-                self.config_replace = FastIronDriver.__creates_list_of_nlines(config)
+                self.config_replace = list_of_nlines(config)
                 self.replace_config = True                  # string successfully saved
                 return
             except ValueError:
@@ -620,7 +796,7 @@ class FastIronDriver(NetworkDriver):
             try:
                 file_content = open(filename, "r")          # attempts to open file
                 temp = file_content.read()                  # stores file content
-                self.config_merge = FastIronDriver.__creates_list_of_nlines(temp)
+                self.config_merge = list_of_nlines(temp)
                 self.merge_config = True                    # file opened successfully
                 return
             except ValueError:
@@ -628,7 +804,7 @@ class FastIronDriver(NetworkDriver):
 
         if config is not None:
             try:
-                self.config_merge = FastIronDriver.__creates_list_of_nlines(config)
+                self.config_merge = list_of_nlines(config)
                 self.merge_config = True                    # string successfully saved
                 return
             except ValueError:
@@ -636,7 +812,7 @@ class FastIronDriver(NetworkDriver):
 
         raise MergeConfigException("Configuration error")
 
-    def compare_config(self):                               # optimize implementation
+    def compare_config(self):
         """
         :return: A string showing the difference between the running configuration and the \
         candidate configuration. The running_config is loaded automatically just before doing the \
@@ -657,13 +833,7 @@ class FastIronDriver(NetworkDriver):
         else:
             return -1                           # No configuration was found
 
-        diff_1 = FastIronDriver.__comparing_list(rc, stored_conf, "+")
-        diff_2 = FastIronDriver.__comparing_list(stored_conf, rc, "-")
-
-        str_diff1 = FastIronDriver.__compare_away(diff_1, diff_2)
-        str_diff2 = FastIronDriver.__compare_vice(diff_2, diff_1)
-
-        return str_diff1 + str_diff2
+        return compare_configs(rc, stored_conf)
 
     def commit_config(self):
         """
@@ -674,27 +844,19 @@ class FastIronDriver(NetworkDriver):
             return -1                                           # returns failure
 
         if self.replace_config is not False:
-            replace_list = list()
-
-            diff_in_config = FastIronDriver.compare_config(self)
-            my_temp = FastIronDriver.__creates_list_of_nlines(diff_in_config)
-
-            for sentence in my_temp:
-
-                if sentence[0] == '-':
-                    sentence = sentence[1:len(sentence)]
-                elif sentence[0] == '+':
-                    sentence = 'no' + sentence[1:len(sentence)]
-                replace_list.append(sentence)
+            running_config = self._send_commands(['show running-config'], use_cache=False)[0]
+            replace_list = replace_commands(list_of_nlines(running_config), self.config_replace)
 
             self.device.config_mode()
             self.device.send_config_set(replace_list)
+            self.__config_changed()
 
             return True
 
         if self.merge_config is not False:  # merges candidate configuration with existing config
             self.device.config_mode()
             self.device.send_config_set(self.config_merge)
+            self.__config_changed()
 
             return True                     # returns success
 
@@ -719,6 +881,7 @@ class FastIronDriver(NetworkDriver):
                 temp = file_content.read()                  # stores file content
                 # sends configuration
                 self.device.send_command(temp)
+                self.__config_changed()
 
                 # Save config to startup
                 self.device.send_command_expect("write mem")
@@ -738,23 +901,35 @@ class FastIronDriver(NetworkDriver):
          * os_version - String with the OS version running on the device.
          * serial_number - Serial number of the device
          * interface_list - List of the interfaces of the device
-        """
-        version_output = self.device.send_command('show version')   # show version output
-        interfaces_up = self.device.send_command('show int brief')  # show int brief output
-        token = interfaces_up.find("Name") + len("Name") + 1
-        interfaces_up = interfaces_up[token:len(interfaces_up)]
-        host_name = self.device.send_command('show running | i hostname')
 
-        return{
-            'uptime': FastIronDriver.__facts_uptime(version_output),    # time of device in sec
+        With the facts_cache optional argument the facts are read from disk while the device
+        was not reloaded or upgraded since they were stored.
+        """
+        facts = self.__cached_facts()
+        if facts is not None:
+            return facts
+
+        version_output = self._send_command('show version')         # show version output
+        self.__set_platform(version_output)                         # refreshes the platform
+        uptime = first('show version', 'uptime', version_output)
+        interfaces_up = self._send_command('show interface brief')  # show int brief output
+        host_name = self._send_command('show running | i hostname')
+
+        facts = {
+            'uptime': parse_duration(uptime['uptime'].split()) if uptime else -1,
             'vendor': 'Ruckus',                                         # Vendor of ICX switches
-            'model':  FastIronDriver.__facts_model(version_output),     # Model type of switch
+            'model':  self._platform['model'],                          # Model type of switch
             'hostname':  FastIronDriver.__facts_hostname(host_name),    # Host name if configured
             'fqdn': None,
-            'os_version':  FastIronDriver.__facts_os_version(version_output),
-            'serial_number':  FastIronDriver.__facts_serial(version_output),
-            'interface_list':  FastIronDriver.__physical_interface_list(interfaces_up)
+            'os_version':  self._platform['os_version'],
+            'serial_number':  self._platform['serial_number'],
+            'interface_list':  [port for port, __ in iter_interface_brief(interfaces_up)]
         }
+        if self._facts_cache is not None and uptime:
+            self._facts_cache.put(self.__facts_key(), time.time() - facts['uptime'],
+                                  facts['os_version'], facts, self._platform)
+            self._facts_checked = True
+        return facts
 
     def get_interfaces(self):
         """
@@ -764,38 +939,31 @@ class FastIronDriver(NetworkDriver):
          * is_up (True/False)
          * is_enabled (True/False)
          * description (string)
-         * last_flapped (int in seconds)
+         * last_flapped (float in seconds)
          * speed (int in Mbit)
+         * mtu (int)
          * mac_address (string)
         """
         my_dict = {}
-        int_brief = self.device.send_command('show int brief')
-        flap_output = self.device.send_command('show interface | i Port')
-        speed_output = self.device.send_command('show interface | i speed')
-        nombre = self.device.send_command('show interface | i name')
-        interfaces = FastIronDriver.__facts_interface_list(int_brief)
-        int_up = FastIronDriver.__facts_interface_list(int_brief, pos=1, del_word="Link")
-        mac_ad = FastIronDriver.__facts_interface_list(int_brief, pos=9, del_word="MAC")
-        flapped = FastIronDriver.__port_time(flap_output)
-        size = len(interfaces)
-
-        is_en = FastIronDriver.__facts_interface_list(int_brief, pos=2, del_word="State")
-        int_speed = FastIronDriver.__facts_interface_list(speed_output, pos=2)
-        actual_spd = FastIronDriver.__get_interface_speed(int_speed)
-
-        flapped = FastIronDriver.__get_interfaces_speed(flapped, size)
-        actual_spd = FastIronDriver.__get_interfaces_speed(actual_spd, size)
-        nombre = FastIronDriver.__get_interface_name(nombre, size)
-
-        for val in range(0, len(interfaces)):   # TODO check size and converto to napalm format
-            my_dict.update({interfaces[val]: {
-                'is up': int_up[val],
-                'is enabled': is_en[val],
-                'description': nombre[val],     # TODO check VE,VLAN,LOPBACK NAME
-                'last flapped': flapped[val],
-                'speed': actual_spd[val],
-                'mac address': mac_ad[val]
-            }})
+        if self._streaming():                           # details parsed while they are read
+            int_brief = self._send_command('show interface brief')
+            details = parse_interface_details(self._send_command_lines('show interface'))
+        else:
+            int_brief, int_detail = self._send_commands(['show interface brief',
+                                                         'show interface'])
+            details = parse_interface_details(int_detail)   # physical port -> flap, speed, name
+
+        for port, brief in iter_interface_brief(int_brief):
+            detail = details.get(port, {})
+            my_dict[port] = {
+                'is_up': brief['link'] == 'Up',
+                'is_enabled': brief['link'] != 'Disable',
+                'description': detail.get('description', brief['name']),
+                'last_flapped': detail.get('last_flapped', -1.0),
+                'speed': detail.get('speed', 0),
+                'mtu': detail.get('mtu', -1),
+                'mac_address': brief['mac'],
+            }
         return my_dict
 
     def get_lldp_neighbors(self):
@@ -806,16 +974,14 @@ class FastIronDriver(NetworkDriver):
             * port
         """
         my_dict = {}
-        shw_int_neg = self.device.send_command('show lldp neighbors')
-        token = shw_int_neg.find('System Name') + len('System Name') + 1
-        my_input = shw_int_neg[token:len(shw_int_neg)]
-        my_test = FastIronDriver.__matrix_format(my_input)
-
-        for seq in range(0, len(my_test)):
-            my_dict.update({my_test[seq][0]: {
-                'hostname': my_test[seq][len(my_test[seq])-1],
-                'port': my_test[seq][3],
-            }})
+        output = self._send_command('show lldp neighbors')
+
+        for neighbor in parse('show lldp neighbors', 'neighbor', output, self.__release()):
+            description = (neighbor['port_description'] or '').split()
+            my_dict[neighbor['local_port']] = {
+                'hostname': neighbor['system_name'],
+                'port': description[0] if description else neighbor['port_id'],
+            }
 
         return my_dict
 
@@ -840,10 +1006,8 @@ class FastIronDriver(NetworkDriver):
                  * used_ram (int) - RAM in use in the device
         """
         main_dictionary = {}
-        chassis_output = self.device.send_command('show chassis')
-        cpu_output = self.device.send_command('show cpu')
-        mem_output = self.device.send_command('show memory')
-        pwr_output = self.device.send_command('show inline power')
+        chassis_output, cpu_output, mem_output, pwr_output = self._send_commands([
+            'show chassis', 'show cpu', 'show memory', 'show inline power'])
         main_dictionary.update(FastIronDriver.__environment_fan(chassis_output))
         main_dictionary.update(FastIronDriver.__environment_temperature(chassis_output))
         main_dictionary.update(FastIronDriver.__environment_power(chassis_output, pwr_output))
@@ -870,31 +1034,8 @@ class FastIronDriver(NetworkDriver):
             * tx_broadcast_packets (int)
             * rx_broadcast_packets (int)
         """
-        int_output = self.device.send_command('show interface brief')
-        ports = FastIronDriver.__facts_interface_list(int_output, trigger=1)
-        interface_counters = dict()
-        stats = self.device.send_command('show interface')
-
-        mul = FastIronDriver.__retrieve_all_locations(stats, 'multicasts,', -2)
-        uni = FastIronDriver.__retrieve_all_locations(stats, 'unicasts', -2)
-        bro = FastIronDriver.__retrieve_all_locations(stats, 'broadcasts,', -2)
-        ier = FastIronDriver.__retrieve_all_locations(stats, "errors,", -3)
-
-        for val in range(len(ports)):
-            interface_counters.update({ports[val]: {
-                'rx_errors': int(ier.pop(0)),
-                'tx_errors': int(ier.pop(0)),
-                'tx_discards': None,    # discard is not put in output of current show int
-                'rx_discards': None,    # alternative is to make individual calls which break
-                'tx_octets': None,
-                'rx_octets': None,
-                'rx_unicast_packets': int(uni.pop(0)),
-                'tx_unicast_packets': int(uni.pop(0)),
-                'rx_multicast_packets': int(mul.pop(0)),
-                'tx_multicast_packets': int(mul.pop(0)),
-                'rx_broadcast_packets': int(bro.pop(0)),
-                'tx_broadcast_packets': int(bro.pop(0))
-            }})
+        stats = self._send_command_lines('show interface')
+        interface_counters = dict(iter_interface_counters(stats))     # one record per port block
 
         return interface_counters
 
@@ -910,59 +1051,33 @@ class FastIronDriver(NetworkDriver):
             * remote_chassis_id (string)
             * remote_system_name (string)
             * remote_system_description (string)
-            * remote_system_capab (string)
-            * remote_system_enabled_capab (string)
-        """
-        if interface == '':                         # no interface was entered
-            print("please enter an interface")
-            return None
-
-        output = self.device.send_command('show lldp neighbor detail port ' + interface)
-        output = output.replace(':', ' ')
-        output = output.replace('"', '')
-        output = (output.replace('+', ' '))
+            * remote_system_capab (list)
+            * remote_system_enable_capab (list)
 
-        if "No neighbors" in output:                # no neighbors found on this interface
-            return {}
+        Without an interface the neighbors of every port are returned.
+        """
+        if interface:
+            output = self._send_command_lines('show lldp neighbor detail port ' + interface)
+        else:                                       # all the ports in a single round trip
+            output = self._send_command_lines('show lldp neighbors detail')
 
-        par_int = FastIronDriver.__retrieve_all_locations(output, "Local", 1)[0]
-        chas_id = FastIronDriver.__retrieve_all_locations(output, "Chassis", 3)[0]
-        sys_nam = FastIronDriver.__retrieve_all_locations(output, "name", 0)[0]
-
-        e_token_sd = output.find("System description") + len("System description")
-        s_token_sc = output.find("System capabilities")
-        e_token_sc = output.find("System capabilities") + len("System capabilities")
-        s_token_ma = output.find("Management address")
-        s_token_la = output.find("Link aggregation")
-        e_token_pd = output.find("Port description") + len("Port description")
-
-        sys_des = output[e_token_sd:s_token_sc]                 # grabs system description
-        sys_cap = output[e_token_sc:s_token_ma]                 # grabs system capability
-        port_de = output[e_token_pd:s_token_la]                 # grabs ports description
-
-        sys_des = FastIronDriver.__unite_strings(sys_des)     # removes excess spaces and n lines
-        sys_cap = FastIronDriver.__unite_strings(sys_cap)
-        port_de = FastIronDriver.__unite_strings(port_de)
-
-        return {interface: [{
-            'parent_interface': par_int,
-            'remote_chassis_id': chas_id,
-            'remote_system_name': sys_nam,
-            'remote_port': port_de,
-            'remote_port_description': '',
-            'remote_system_description': sys_des,
-            'remote_system_capab': sys_cap,
-            'remote_system_enable_capab': None
-        }]}
+        neighbors = parse_lldp_neighbors(output)
+        if interface and neighbors:                 # keyed as requested, e.g. ethe 1/1/1
+            return {interface: [entry for port in neighbors for entry in neighbors[port]]}
+        return neighbors
 
     def cli(self, commands):
+        """Sends the list of commands one at a time, returns a dictionary of outputs.
 
+        Unlike show commands sent by the getters, any command may change the prompt or wait for
+        an answer, so they are not batched.
+        """
         cli_output = dict()
         if type(commands) is not list:
             raise TypeError('Please enter a valid list of commands!')
 
-        for command in commands:
-            output = self.device._send_command(command)
+        outputs = [self._send_commands([command], use_cache=False)[0] for command in commands]
+        for command, output in zip(commands, outputs):
             if 'Invalid input detected' in output:
                 raise ValueError('Unable to execute command "{}"'.format(command))
             cli_output.setdefault(command, {})
@@ -977,6 +1092,7 @@ class FastIronDriver(NetworkDriver):
             raise TypeError('Please enter a valid list of commands!')
 
         self.device.send_config_set(commands)
+        self.__config_changed()
 
     def config_mode(self):
         """ Enter into config mode"""
@@ -1008,7 +1124,7 @@ class FastIronDriver(NetworkDriver):
     ################################################################
 
     # Napalm Base Functions
-    def get_arp_table(self):
+    def get_arp_table(self, vrf="", interface=None, address=None):
 
         """
         Returns a list of dictionaries having the following set of keys:
@@ -1016,36 +1132,39 @@ class FastIronDriver(NetworkDriver):
             * mac (string)
             * ip (string)
             * age (float)
-        """
-        output = self.device.send_command('show arp')
-        token = output.find('Status') + len('Status') + 1
-        vtoken = output.find('VLAN') + len('VLAN') + 1
 
-        if vtoken != 0:                # router version does not contain default vlan in arp
-            token = vtoken
-
-        output = FastIronDriver.__creates_list_of_nlines(output[token:len(output)])
-        arp_table = list()
-
-        for val in output:
+        The table can be narrowed to a vrf, an interface (1/1/1) or an ip address. The filter is
+        sent to the device so only matching entries are transferred, and applied locally when
+        the device does not support the narrowed command.
+        """
+        command = 'show arp'
+        if vrf:
+            command += ' vrf ' + vrf
+            narrowed = None                             # vrf is the only filter sent
+        elif address is not None:
+            narrowed = 'show arp ' + address
+        elif interface is not None and '/' in interface:
+            narrowed = 'show arp ethernet ' + interface
+        else:
+            narrowed = None
 
-            check = val
-            if len(check.split()) < 7:
-                continue
+        lines = self._send_command_lines(FastIronDriver.__narrowed(narrowed, command))
+        return list(iter_arp_entries(lines, interface=interface, address=address))
 
-            if vtoken == 0:
-                __, ip, mac, __, age, interface, __ = val.split()
-            else:
-                __, ip, mac, __, age, interface, __, vlan = val.split()
+    def __ntp_associations(self):
+        """Returns the rows of show ntp associations, parsed once per distinct output.
 
-            arp_table.append({
-                'interface': interface,
-                'mac': mac,
-                'ip': ip,
-                'age': float(age),
-            })
+        The three NTP getters share the parse, and with get_many() or cache_ttl the command.
+        """
+        output = self._send_command('show ntp associations')
+        if self._ntp is None or self._ntp[0] != output:
+            self._ntp = (output, parse('show ntp associations', 'association', output,
+                                       self.__release()))
+        return self._ntp[1]
 
-        return arp_table
+    def __ntp_addresses(self):
+        """Returns the {address: {}} dictionary of the associations, as peers and servers are."""
+        return dict((association['address'], {}) for association in self.__ntp_associations())
 
     def get_ntp_peers(self):
 
@@ -1064,19 +1183,7 @@ class FastIronDriver(NetworkDriver):
             }
 
         """
-        output = self.device.send_command('show ntp associations')
-        token = output.find('disp') + len('disp') + 1
-        output = output[token:len(output)]
-        nline = FastIronDriver.__creates_list_of_nlines(output)
-        ntp_peers = dict()
-        for val in range(len(nline)-1):
-            val = nline[val].replace("~", " ")
-            val = val.split()
-            ntp_peers.update({
-                val[1]: {}
-            })
-
-        return ntp_peers
+        return self.__ntp_addresses()
 
     def get_ntp_servers(self):
 
@@ -1085,19 +1192,7 @@ class FastIronDriver(NetworkDriver):
         The keys of the dictionary represent the IP Addresses of the servers.
         Inner dictionaries do not have yet any available keys.
         """
-        output = self.device.send_command('show ntp associations')
-        token = output.find('disp') + len('disp') + 1
-        output = output[token:len(output)]
-        nline = FastIronDriver.__creates_list_of_nlines(output)
-        ntp_servers = dict()
-        for val in range(len(nline)-1):
-            val = nline[val].replace("~", " ")
-            val = val.split()
-            ntp_servers.update({
-                val[2]: {}
-            })
-
-        return ntp_servers
+        return self.__ntp_addresses()
 
     def get_ntp_stats(self):
 
@@ -1116,44 +1211,19 @@ class FastIronDriver(NetworkDriver):
             * offset (float)
             * jitter (float)
         """
-        my_list = list()
-        output = self.device.send_command('show ntp associations')
-        token = output.find('disp') + len('disp') + 1
-        end_token = output.find('synced,') - 3
-        output = output[token:end_token]
-        nline = FastIronDriver.__creates_list_of_nlines(output)
-
-        for sentence in nline:
-            isbool = False
-            # sentence = sentence.split()
-            remote, refid, stra, when, hostpoll, \
-                reach, delay, offset, jitter = sentence.split()
-
-            if "*" in sentence:
-                isbool = True
-
-            # sentence[0] = sentence[0].replace('*', '')
-            # sentence[0] = sentence[0].replace('+', '')
-            # sentence[0] = sentence[0].replace('~', '')
-
-            remote = remote.replace('*', '')
-            remote = remote.replace('+', '')
-            remote = remote.replace('~', '')
-
-            my_list.append({
-                'remote': remote,
-                'referenceid': refid,
-                'synchronized': isbool,
-                'stratum': int(stra),
-                'type': u'-',
-                'when': int(when),
-                'hostpoll': int(hostpoll),
-                'reachability': float(reach),
-                'delay': float(delay),
-                'offset': float(offset),
-                'jitter': float(jitter)
-            })
-        return my_list
+        return [{
+            'remote': association['address'],
+            'referenceid': association['refid'],
+            'synchronized': '*' in association['flags'],
+            'stratum': association['stratum'],
+            'type': u'-',
+            'when': association['when'],
+            'hostpoll': association['poll'],
+            'reachability': association['reach'],
+            'delay': association['delay'],
+            'offset': association['offset'],
+            'jitter': association['disp'],
+        } for association in self.__ntp_associations()]
 
     def get_interfaces_ip(self):
 
@@ -1166,18 +1236,18 @@ class FastIronDriver(NetworkDriver):
         Each IP Address dictionary has the following keys:
             * prefix_length (int)
         """
-        if self.image_type == "Switch":
+        if self.platform['image_type'] == "Switch":
             print("Switch image does not have ip interface")
             return {}
 
         ip_interface = dict()
         ip4_dict = dict()                                       # ip4 dict
         ip6_dict = dict()                                       # ip6 dict
-        output = self.device.send_command('show ip interface')  # obtains ip4 information
-        ipv6_output = self.device.send_command('show ipv6 interface')   # obtains ip6 information
+        output = self._send_command('show ip interface')  # obtains ip4 information
+        ipv6_output = self._send_command('show ipv6 interface')   # obtains ip6 information
         token = output.find('VRF') + len('VRF') + 4                 # finds when to start parsing
         output = output[token:len(output)]              # grabs output within certain limits
-        n_line = FastIronDriver.__creates_list_of_nlines(output)
+        n_line = list_of_nlines(output)
         last_port = ""                                          # saves last port information
 
         for index in range(len(n_line)):
@@ -1209,7 +1279,7 @@ class FastIronDriver(NetworkDriver):
 
         return ip_interface
 
-    def get_mac_address_table(self):
+    def get_mac_address_table(self, vlan=None, interface=None, address=None):
 
         """
         Returns a lists of dictionaries. Each dictionary represents an entry in the MAC Address
@@ -1221,35 +1291,33 @@ class FastIronDriver(NetworkDriver):
             * static (boolean)
             * moves (int)
             * last_move (float)
-        """
-        mac_tbl = list()                                            # creates list
-        output = self.device.send_command('show mac-address all')   # grabs mac address output
-        token = output.find('Action') + len('Action') + 1           # word used for parser
-        new_out = FastIronDriver.__creates_list_of_nlines(output[token: len(output)])
-        for words in new_out:                            # loop goes sentence by sentence
-            sentence = words.split()                                # breaks sentence into words
 
-            if sentence[2] == 'Dynamic':
-                is_dynamic = True
-            else:
-                is_dynamic = False
+        The table can be narrowed to a vlan, an interface (1/1/1) or a mac address. The filter is
+        sent to the device so only matching entries are transferred, and applied locally when
+        the device does not support the narrowed command.
+        """
+        return list(self.iter_mac_address_table(vlan=vlan, interface=interface, address=address))
 
-            if sentence[4] == 'forward':
-                is_active = True
-            else:
-                is_active = False
-
-            mac_tbl.append({                            # appends data
-                'mac': sentence[0],
-                'interface': sentence[1],
-                'vlan': int(sentence[3]),
-                'static': is_dynamic,
-                'active': is_active,
-                'moves': None,
-                'last_move': None
-            })
+    def iter_mac_address_table(self, compact=False, vlan=None, interface=None, address=None):
+        """
+        Yields the entries of the MAC Address Table one at a time, with the same keys and filters
+        as get_mac_address_table(). When compact is True entries are MacEntry records (__slots__
+        objects with a to_dict() method) instead of dictionaries.
+        """
+        if address is not None:                     # most selective filter is sent to device
+            narrowed = 'show mac-address ' + normalize_mac(address)
+        elif interface is not None:
+            narrowed = 'show mac-address ethernet ' + interface
+        elif vlan is not None:
+            narrowed = 'show mac-address vlan ' + str(vlan)
+        else:
+            narrowed = None
 
-        return mac_tbl
+        lines = self._send_command_lines(FastIronDriver.__narrowed(narrowed,
+                                                                   'show mac-address all'))
+        for entry in iter_mac_entries(lines, compact, vlan=vlan, interface=interface,
+                                      address=address):
+            yield entry
 
     def get_users(self):
         """
@@ -1264,25 +1332,20 @@ class FastIronDriver(NetworkDriver):
         full access to the device.
         """
 
-        output = self.device.send_command('show users')
+        output = self._send_command('show users')
         user_dict = dict()
-        token = output.rfind('=') + 1
-
-        n_line = FastIronDriver.__creates_list_of_nlines(output[token:len(output)])
-        for line in n_line:
-
-            user, password, encrpt, priv, status, exptime = line.split()
 
-            if int(priv) == 0:
+        for user in parse('show users', 'user', output, self.__release()):
+            if user['priv'] == 0:                       # privilege 0 is super-user
                 lv = 15
-            elif int(priv) == 4:
+            elif user['priv'] == 4:                     # port-config
                 lv = 8
-            else:
+            else:                                       # read-only
                 lv = 3
 
-            user_dict.update({user: {
+            user_dict.update({user['username']: {
                 'level': lv,
-                'password': password,
+                'password': user['password'],
                 'sshkeys': []
             }})
         return user_dict
@@ -1324,8 +1387,8 @@ class FastIronDriver(NetworkDriver):
                 config_dic.update({'candidate': {}})
                 continue
 
-            output = self.device.send_command(cmd)
-            n_line = FastIronDriver.__creates_list_of_nlines(output)
+            output = self._send_command(cmd)
+            n_line = list_of_nlines(output)
 
             if cmd == 'show running-config':
                 config_dic.update({'running': n_line})
@@ -1340,21 +1403,12 @@ class FastIronDriver(NetworkDriver):
         """Return a dictionary of network instances (VRFs) configured."""
         vrf_dict = dict()                                           # Dictionary that will append
         vrf_interface = dict()
-        check = self.device.send_command('show version')
-
-        if any(x in check for x in ["7150", "SPS"]):                # ICX7150 does not support VRF
-            return {}                                               # neither does switch image
-
-        if "7250" in check:
-            cur_version = FastIronDriver.__retrieve_all_locations(check, 'Version', 1)
 
-            if cur_version.pop() > "8.0.50":
-                pass
-            else:
-                return {}
+        if not self.platform['vrf_support']:                        # ICX7150, switch image and
+            return {}                                               # older ICX7250 releases
 
         if name != '':                                              # Name was entered must look
-            output = self.device.send_command('show vrf ' + name)   # grabs vrf of specified name
+            output = self._send_command('show vrf ' + name)   # grabs vrf of specified name
             token = output.find('Interfaces:') + len('Interfaces:') + 1
             ioutput = output[token:len(output)]                     # limits scope of output range
             sentence = ioutput.split()                              # returns strings of interest
@@ -1374,9 +1428,9 @@ class FastIronDriver(NetworkDriver):
                         }}}
 
         else:
-            output = self.device.send_command('show vrf detail')
+            output = self._send_command('show vrf detail')
             output = output.replace('|', ' ')
-            output = output.replace(',', '')
+            output = TokenizedOutput(output.replace(',', ''))
             vrf_name_list = FastIronDriver.__retrieve_all_locations(output, 'VRF', 0)
             vrf_rd = FastIronDriver.__retrieve_all_locations(output, 'RD', 0)
 
@@ -12,13 +12,45 @@
 # License for the specific language governing permissions and limitations under
 # the License.
 
-"""napalm-ruckus-fastiron package."""
-import pkg_resources
-from napalm_ruckus_fastiron.FastIron import FastIronDriver
+"""napalm-ruckus-fastiron package.
 
-try:
-    __version__ = pkg_resources.get_distribution('napalm-ruckus-fastiron').version
-except pkg_resources.DistributionNotFound:
-    __version__ = "Not installed"
+The driver, and with it napalm and netmiko, is only imported when one of its names is first
+used, so the parsers of napalm_ruckus_fastiron.utils can be imported on their own.
+"""
+import importlib
+import sys
 
-__all__ = ["FastIronDriver"]
+__all__ = ["FastIronDriver", "FleetResult", "run_fleet"]
+
+_LAZY = {
+    'FastIronDriver': 'napalm_ruckus_fastiron.FastIron',
+    'FleetResult': 'napalm_ruckus_fastiron.fleet',
+    'run_fleet': 'napalm_ruckus_fastiron.fleet',
+}
+
+
+def _version():
+    import pkg_resources
+    try:
+        return pkg_resources.get_distribution('napalm-ruckus-fastiron').version
+    except pkg_resources.DistributionNotFound:
+        return "Not installed"
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name == '__version__':
+            value = _version()
+        elif name in _LAZY:
+            value = getattr(importlib.import_module(_LAZY[name]), name)
+        else:
+            raise AttributeError("module %r has no attribute %r" % (__name__, name))
+        globals()[name] = value                 # later lookups skip __getattr__
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(__all__) | {'__version__'})
+else:                                           # no module __getattr__ (PEP 562)
+    from napalm_ruckus_fastiron.FastIron import FastIronDriver  # noqa
+    from napalm_ruckus_fastiron.fleet import FleetResult, run_fleet  # noqa
+    __version__ = _version()
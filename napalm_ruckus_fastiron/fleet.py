@@ -0,0 +1,154 @@
+"""Runs FastIron getters concurrently across many devices."""
+
+# Python3 support
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from napalm_ruckus_fastiron.FastIron import FastIronDriver
+
+
+class FleetResult(object):
+    """Outcome of running the getters on a single device."""
+
+    __slots__ = ('hostname', 'results', 'errors', 'error', 'elapsed')
+
+    def __init__(self, hostname, results=None, errors=None, error=None, elapsed=0.0):
+        self.hostname = hostname
+        self.results = results if results is not None else dict()   # getter -> returned value
+        self.errors = errors if errors is not None else dict()      # getter -> error message
+        self.error = error                                           # connection level error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.error is None and not self.errors
+
+    def to_dict(self):
+        return {
+            'hostname': self.hostname,
+            'results': self.results,
+            'errors': self.errors,
+            'error': self.error,
+            'elapsed': self.elapsed,
+        }
+
+
+class _DeviceTask(object):
+    """Opens one device, runs the getters and closes it, keeps track of the running driver."""
+
+    def __init__(self, device, getters, driver, timeout):
+        self.device = device
+        self.getters = getters
+        self.driver = driver
+        self.timeout = device.get('device_timeout', timeout)
+        self.started = None                     # set by the worker thread once it runs
+        self.connection = None
+        self.lock = threading.Lock()
+
+    @property
+    def hostname(self):
+        return self.device['hostname']
+
+    def expired(self, now):
+        return self.timeout is not None and self.started is not None and \
+            now - self.started > self.timeout
+
+    def run(self):
+        self.started = time.time()
+        result = FleetResult(self.hostname)
+        connection = self.driver(self.device['hostname'],
+                                 self.device.get('username', ''),
+                                 self.device.get('password', ''),
+                                 timeout=self.device.get('timeout', 60),
+                                 optional_args=self.device.get('optional_args'))
+        with self.lock:
+            self.connection = connection
+        try:
+            connection.open()
+        except Exception as e:
+            result.error = str(e)
+            result.elapsed = time.time() - self.started
+            return result
+
+        try:
+            self._run_getters(connection, result)
+        finally:
+            self.abort()
+        result.elapsed = time.time() - self.started
+        return result
+
+    def _run_getters(self, connection, result):
+        for getter in self.getters:
+            try:
+                result.results[getter] = getattr(connection, getter)()
+            except Exception as e:                  # one getter must not break the others
+                result.errors[getter] = "%s: %s" % (type(e).__name__, e)
+
+    def abort(self):
+        """Closes the connection, unblocks a worker stuck reading from a hung device."""
+        with self.lock:
+            connection, self.connection = self.connection, None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+
+def run_fleet(inventory, getters, max_workers=32, timeout=300, driver=FastIronDriver):
+    """Runs getters on every device of inventory and yields a FleetResult per device.
+
+    inventory is a list of dictionaries with the hostname, username, password and the optional
+    timeout (netmiko), optional_args and device_timeout keys. At most max_workers devices are
+    polled at the same time and results are yielded as soon as each device completes.
+
+    timeout (or the device_timeout of an entry) bounds the wall time spent on a single device,
+    a device that exceeds it gets an error result and its connection is closed so the rest of
+    the batch is not stalled.
+    """
+    for getter in getters:
+        if not callable(getattr(driver, getter, None)):
+            raise AttributeError("%s has no getter %s" % (driver.__name__, getter))
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = dict()                                # future -> _DeviceTask
+    try:
+        for device in inventory:
+            task = _DeviceTask(device, getters, driver, timeout)
+            pending[executor.submit(task.run)] = task
+
+        while pending:
+            for result in _completed(pending):
+                yield result
+            for result in _expired(pending):
+                yield result
+    finally:
+        for future in pending:                      # the caller stopped consuming results
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _completed(pending):
+    """Waits a little for devices to complete, yields and forgets their results."""
+    done, __ = wait(list(pending), timeout=0.5, return_when=FIRST_COMPLETED)
+    for future in done:
+        task = pending.pop(future)
+        try:
+            yield future.result()
+        except Exception as e:
+            yield FleetResult(task.hostname, error=str(e))
+
+
+def _expired(pending):
+    """Aborts the devices running for longer than their timeout, yields an error result each."""
+    now = time.time()
+    for future, task in list(pending.items()):
+        if task.expired(now):
+            del pending[future]
+            task.abort()
+            yield FleetResult(task.hostname, elapsed=now - task.started,
+                              error="Timed out after %s seconds" % task.timeout)
@@ -0,0 +1,88 @@
+"""Session scoped cache for the output of show commands."""
+
+# Python3 support
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import threading
+import time
+
+# abbreviations accepted by the FastIron CLI, expanded so both forms share an entry
+ABBREVIATIONS = {
+    'sh': 'show',
+    'int': 'interface',
+    'run': 'running-config',
+    'running': 'running-config',
+}
+
+
+def normalize_command(command):
+    """Returns the cache key of a command.
+
+    Extra spacing is collapsed and the keywords in front of an output filter ('|') are expanded
+    from their usual abbreviations, the filter itself is kept as typed.
+    """
+    command, pipe, output_filter = command.partition('|')
+    words = [ABBREVIATIONS.get(word, word) for word in command.split()]
+    key = ' '.join(words)
+    if pipe:
+        key += ' | ' + ' '.join(output_filter.split())
+    return key
+
+
+class CommandCache(object):
+    """Keeps the output of show commands for ttl seconds, a ttl of 0 disables the cache."""
+
+    def __init__(self, ttl=0):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = dict()                      # key -> (timestamp, output)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.ttl) and self.ttl > 0
+
+    def get(self, command):
+        """Returns the cached output of command or None if it is missing or expired."""
+        if not self.enabled:
+            return None
+
+        key = normalize_command(command)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] < self.ttl:
+                self.hits += 1
+                return entry[1]
+
+            self._entries.pop(key, None)            # drops the expired entry, if any
+            self.misses += 1
+            return None
+
+    def put(self, command, output):
+        """Stores the output of command."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[normalize_command(command)] = (time.time(), output)
+
+    def invalidate(self, command=None):
+        """Drops the entry of command, or every entry when no command is given."""
+        with self._lock:
+            if command is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(normalize_command(command), None)
+
+    def stats(self):
+        """Returns the hit and miss counters of the cache."""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+            }
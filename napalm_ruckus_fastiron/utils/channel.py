@@ -0,0 +1,188 @@
+"""Helpers to work with the raw output read from a FastIron CLI channel."""
+
+# Python3 support
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import re
+import threading
+
+from napalm_ruckus_fastiron.utils.cache import normalize_command
+
+
+def prompt_pattern(base_prompt):
+    """Returns a compiled pattern matching the FastIron prompt at the start of a line.
+
+    Matches the exec (SSH@ICX7250#), user (SSH@ICX7250>) and configuration
+    (SSH@ICX7250(config-if-e1000-1/1/1)#) forms of the prompt.
+    """
+    return re.compile(r'^' + re.escape(base_prompt) + r'(?:\([^)\n]*\))?[>#]', re.MULTILINE)
+
+
+def shell_pattern(base_prompt):
+    """Returns a compiled pattern matching what a shell waits for at the end of the output.
+
+    Either the prompt, its mode group being > or #, or a login group asking for the user name
+    or password of the enable command.
+    """
+    return re.compile(r'(?:^' + re.escape(base_prompt) + r'(?:\([^)\n]*\))?(?P<mode>[>#])|'
+                      r'(?P<login>[Uu]ser ?[Nn]ame|[Pp]assword):)\s*$', re.MULTILINE)
+
+
+def count_prompts(pattern, output, pos=0):
+    """Returns the number of prompts found in output from pos and where the last one ends."""
+    count = 0
+    match = pattern.search(output, pos)
+    while match:
+        count += 1
+        pos = match.end()
+        match = pattern.search(output, pos)
+    return count, pos
+
+
+def split_by_prompt(output, commands, pattern):
+    """Splits the output of commands sent back to back into one output per command.
+
+    Every command output is delimited by the prompt printed when the command completes, the
+    echo of the command (first line of each part) is removed.
+    """
+    parts = pattern.split(output)
+    if len(parts) - 1 < len(commands):
+        raise ValueError("Expected %d prompts, found %d" % (len(commands), len(parts) - 1))
+
+    outputs = list()
+    for part in parts[:len(commands)]:
+        __, __, part = part.partition('\n')             # drops the echoed command
+        outputs.append(part.rstrip('\n'))
+    return outputs
+
+
+def iter_stream_lines(chunks, pattern):
+    """Yields the lines of a command output while chunks of it are still read from the channel.
+
+    chunks is an iterable of the raw text read after sending one command. The echo of the
+    command (first line) is skipped and the lines end with the prompt printed when the command
+    completes, chunks are not consumed past it.
+    """
+    buffer = ''
+    echo = True
+    for chunk in chunks:
+        lines = (buffer + chunk).split('\n')
+        buffer = lines.pop()                            # incomplete last line
+        for line in lines:
+            if echo:
+                echo = False
+                continue
+            if pattern.match(line):
+                return
+            yield line.rstrip('\r')
+        if pattern.match(buffer):                       # the prompt is not followed by a newline
+            return
+    if buffer and not echo:
+        yield buffer.rstrip('\r')
+
+
+class CommandProfile(object):
+    """Latency and size of the outputs of every command sent during a session.
+
+    The read timeout of a command only grows past the default once the command is known to
+    return a large output, every other command keeps the default.
+    """
+
+    def __init__(self, large_output=65536, growth=3.0):
+        self.large_output = large_output                # bytes from which an output is large
+        self.growth = growth                            # timeout is growth * slowest read
+        self._commands = dict()
+        self._lock = threading.Lock()
+
+    def record(self, command, elapsed, size):
+        """Stores the time taken and number of bytes received by one execution of command."""
+        key = normalize_command(command)
+        with self._lock:
+            stats = self._commands.get(key)
+            if stats is None:
+                stats = self._commands[key] = {'count': 0, 'total': 0.0, 'max': 0.0,
+                                               'last': 0.0, 'bytes': 0}
+            stats['count'] += 1
+            stats['total'] += elapsed
+            stats['last'] = elapsed
+            stats['max'] = max(stats['max'], elapsed)
+            stats['bytes'] = max(stats['bytes'], size)
+
+    def read_timeout(self, command, default):
+        """Returns how long to wait for the prompt after sending command."""
+        with self._lock:
+            stats = self._commands.get(normalize_command(command))
+        if stats is None or stats['bytes'] < self.large_output:
+            return default
+        return max(default, stats['max'] * self.growth)
+
+    def cost(self, command):
+        """Returns the mean time (seconds) of command, 0 if it was never sent."""
+        with self._lock:
+            stats = self._commands.get(normalize_command(command))
+        return stats['total'] / stats['count'] if stats else 0.0
+
+    def timings(self):
+        """Returns count, mean, last and max time (seconds) and largest output of every command."""
+        with self._lock:
+            return dict((key, {
+                'count': stats['count'],
+                'mean': stats['total'] / stats['count'],
+                'last': stats['last'],
+                'max': stats['max'],
+                'bytes': stats['bytes'],
+            }) for key, stats in self._commands.items())
+
+
+class ShellChannel(object):
+    """Additional interactive shell opened on the SSH transport of a netmiko session.
+
+    Offers the raw channel methods of the netmiko connection used by the prompt reader, the
+    output clean up being delegated to session.
+    """
+
+    def __init__(self, channel, session):
+        self.channel = channel
+        self.session = session
+        self.base_prompt = session.base_prompt
+        self.RETURN = session.RETURN
+
+    def write_channel(self, data):
+        self.channel.sendall(data.encode('utf-8'))
+
+    def read_channel(self):
+        output = b''
+        while self.channel.recv_ready():
+            output += self.channel.recv(65535)
+        if not output and self.channel.closed:
+            raise EOFError('Channel closed by the device')
+        return output.decode('utf-8', 'ignore')
+
+    def clear_buffer(self):
+        self.read_channel()
+
+    def normalize_linefeeds(self, output):
+        return self.session.normalize_linefeeds(output)
+
+    def strip_ansi_escape_codes(self, output):
+        return self.session.strip_ansi_escape_codes(output)
+
+    def close(self):
+        self.channel.close()
+
+
+def assign_commands(commands, costs, count):
+    """Spreads the indexes of commands over count channels, the most expensive first.
+
+    Every command goes to the channel with the least expected time so far, costs being the
+    expected seconds of each command (0 when unknown, ties go to the channel with the fewest
+    commands). Returns one list of indexes per channel, each in the original order.
+    """
+    groups = [list() for __ in range(count)]
+    loads = [0.0] * count
+    for index in sorted(range(len(commands)), key=lambda pos: -costs[pos]):
+        channel = min(range(count), key=lambda pos: (loads[pos], len(groups[pos])))
+        groups[channel].append(index)
+        loads[channel] += costs[index]
+    return [sorted(group) for group in groups]
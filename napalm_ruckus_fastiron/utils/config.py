@@ -0,0 +1,244 @@
+"""Comparison of FastIron configurations."""
+
+# Python3 support
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+
+SKIPPED = ('!', 'end', 'Current configuration:')    # not part of the configuration tree
+PERMANENT = ('interface ethernet', 'interface management')  # contexts that cannot be removed
+# commands holding a single value, replaced by setting the new one without negating the old one
+SINGLE_VALUED = ('hostname', 'port-name', 'speed-duplex', 'ip default-gateway',
+                 'snmp-server contact', 'snmp-server location', 'clock timezone')
+CONTEXTS = {'vlan': 2, 'interface': 3, 'router': 2}  # context -> words identifying it
+
+
+def config_blocks(config_lines):
+    """Groups the lines of a configuration in blocks, one per '!' separated section.
+
+    The first line of a block is its header. Lines found before the first '!' (banner, version)
+    and the closing 'end' are not part of any block.
+    """
+    blocks = list()
+    block = None                                # None until the first '!' is found
+    for line in config_lines:
+        if line.strip() == '!':
+            if block:
+                blocks.append(block)
+            block = list()
+        elif block is not None:
+            block.append(line)
+
+    if block and block != ['end']:              # section left open at the end of the config
+        if block[-1] == 'end':
+            block.pop()
+        blocks.append(block)
+    return blocks
+
+
+def index_blocks(blocks):
+    """Returns a dictionary mapping the header of every block to the set of its lines."""
+    index = dict()
+    for block in blocks:
+        index.setdefault(block[0], set()).update(block)
+    return index
+
+
+def diff_blocks(blocks_1, blocks_2, symbol):
+    """Returns the blocks of blocks_1 that are not in blocks_2 with the missing lines marked.
+
+    When a block with the same header exists in blocks_2 the header is kept unmarked and only the
+    lines missing from it are returned prefixed by symbol, otherwise the whole block is marked.
+    """
+    identical = set(tuple(block) for block in blocks_2)
+    index_2 = index_blocks(blocks_2)
+    diff = list()
+
+    for block in blocks_1:
+        if tuple(block) in identical:           # unchanged block
+            continue
+
+        header = block[0]
+        lines_2 = index_2.get(header)
+        if lines_2 is None:                     # block does not exist in the other config
+            diff.append([symbol + " " + line for line in block])
+            continue
+
+        changed = [header]
+        changed.extend(symbol + " " + line for line in block[1:] if line not in lines_2)
+        if len(changed) > 1:
+            diff.append(changed)
+
+    return diff
+
+
+def compare_configs(running, candidate):
+    """Returns the difference between two configurations given as lists of lines.
+
+    Lines only found in the candidate are prefixed with '-' and lines only found in the running
+    configuration with '+', which is how commit_config() tells lines to add from lines to
+    negate. Blocks present in both configurations are printed under their header.
+    """
+    diff_1 = diff_blocks(config_blocks(running), config_blocks(candidate), "+")
+    diff_2 = diff_blocks(config_blocks(candidate), config_blocks(running), "-")
+
+    added = dict()                              # header -> candidate lines under that header
+    for block in diff_2:
+        added.setdefault(block[0], list()).extend(block[1:])
+
+    output = list()
+    headers_1 = set()
+    for block in diff_1:
+        headers_1.add(block[0])
+        output.append(block[0])
+        output.extend(added.get(block[0], ()))
+        output.extend(block[1:])
+
+    for block in diff_2:                        # blocks with only candidate lines
+        if block[0] not in headers_1:
+            output.extend(block)
+
+    return "".join(line + '\n' for line in output)
+
+
+class ConfigNode(object):
+    """One command of a configuration, the commands of its context being its children.
+
+    children maps the command (stripped of its indentation) to its node, in configuration order.
+    """
+
+    __slots__ = ('command', 'children')
+
+    def __init__(self, command=None):
+        self.command = command
+        self.children = OrderedDict()
+
+    def add(self, command):
+        """Returns the child node of command, created at the end of the context if missing."""
+        node = self.children.get(command)
+        if node is None:
+            node = self.children[command] = ConfigNode(command)
+        return node
+
+    def get(self, command):
+        return self.children.get(command)
+
+    def lines(self, depth=0):
+        """Returns the commands below the node, indented by their depth."""
+        lines = list()
+        for command, node in self.children.items():
+            lines.append(' ' * depth + command)
+            lines.extend(node.lines(depth + 1))
+        return lines
+
+
+def parse_config(config_lines):
+    """Returns the root ConfigNode of a configuration given as a list of lines.
+
+    Contexts are nested by indentation, so a command belongs to the closest command above it
+    with less indentation. The '!' separators, the banner, the image version and 'end' are left
+    out.
+    """
+    root = ConfigNode()
+    stack = [(-1, root)]                        # (indentation, node) of the open contexts
+    for line in config_lines:
+        command = line.strip()
+        if not command or command in SKIPPED or command.startswith('ver '):
+            if command == '!':
+                del stack[1:]                   # a separator closes every context
+            continue
+        indent = len(line) - len(line.lstrip())
+        while stack[-1][0] >= indent:
+            stack.pop()
+        node = stack[-1][1].add(command)
+        stack.append((indent, node))
+    return root
+
+
+def negate(command):
+    """Returns the command removing command."""
+    return command[3:] if command.startswith('no ') else 'no ' + command
+
+
+def _single_valued(command):
+    for prefix in SINGLE_VALUED:
+        if command == prefix or command.startswith(prefix + ' '):
+            return prefix
+    return None
+
+
+def _subtree(node):
+    """Returns the commands creating node and its context, left with exit."""
+    commands = [node.command]
+    for child in node.children.values():
+        commands.extend(_subtree(child))
+    if node.children:
+        commands.append('exit')
+    return commands
+
+
+def _context_key(command):
+    """Returns the words identifying the context opened by command, or command itself.
+
+    vlan 10 name users by port -> vlan 10, so a context is matched across its attributes.
+    """
+    words = command.split()
+    if words and words[0] in CONTEXTS:
+        return ' '.join(words[:CONTEXTS[words[0]]])
+    return command
+
+
+def _by_key(node):
+    return dict((_context_key(command), child) for command, child in node.children.items())
+
+
+def _removals(running, candidate):
+    """Returns the commands removing what the candidate context no longer has."""
+    commands = list()
+    replaced = set(prefix for prefix in map(_single_valued, candidate.children) if prefix)
+    kept = _by_key(candidate)
+
+    for command, node in running.children.items():
+        if _context_key(command) in kept:
+            continue
+        if not node.children or not command.startswith(PERMANENT):
+            if _single_valued(command) not in replaced:
+                commands.append(negate(command))        # removes the whole context at once
+            continue
+        commands.append(command)                        # emptied, not removed
+        commands.extend(negate(child) for child in node.children)
+        commands.append('exit')
+    return commands
+
+
+def _diff(running, candidate):
+    """Returns the commands turning the running context into the candidate one."""
+    commands = _removals(running, candidate)            # removals first
+    contexts = _by_key(running)
+
+    for command, node in candidate.children.items():
+        current = contexts.get(_context_key(command))
+        if current is None:
+            commands.extend(_subtree(node))
+            continue
+        changes = _diff(current, node)
+        if changes or current.command != command:       # the new header updates it in place
+            commands.append(command)
+            commands.extend(changes)
+            commands.append('exit')
+    return commands
+
+
+def replace_commands(running, candidate):
+    """Returns the ordered commands turning the running configuration into the candidate one.
+
+    Both are lists of lines. In every context the commands missing from the candidate are
+    negated first, removed contexts with a single command, then the missing commands are added.
+    Commands holding a single value are only set to their new value. Contexts are matched by
+    their identity (vlan 10, interface ethernet 1/1/1, router bgp), so a changed attribute of
+    the header is set by entering the existing context with the new header instead of removing
+    it. Contexts without changes are not entered, and every context entered is left with exit,
+    so the next command is not typed inside it.
+    """
+    return _diff(parse_config(running), parse_config(candidate))
@@ -0,0 +1,81 @@
+"""Facts of the devices kept on disk, shared by the processes using the same file."""
+
+# Python3 support
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import json
+import sqlite3
+import time
+
+SCHEMA = '''CREATE TABLE IF NOT EXISTS facts (
+    device TEXT PRIMARY KEY,
+    boot REAL NOT NULL,
+    os_version TEXT,
+    facts TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    updated REAL NOT NULL
+)'''
+
+
+class FactsCache(object):
+    """get_facts() results and platform of every device, in a sqlite database at path.
+
+    An entry stays valid while the device keeps the boot time and release it was stored with,
+    boot times being compared within slack seconds as they are derived from the uptime.
+    """
+
+    def __init__(self, path, slack=120):
+        self.path = path
+        self.slack = slack
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(SCHEMA)
+        finally:
+            connection.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)   # waits for the other writers
+
+    def get(self, device):
+        """Returns the boot, os_version, facts and platform stored for device, or None."""
+        connection = self._connect()
+        try:
+            row = connection.execute('SELECT boot, os_version, facts, platform FROM facts '
+                                     'WHERE device = ?', (device,)).fetchone()
+        finally:
+            connection.close()
+        if row is None:
+            return None
+        platform = json.loads(row[3])
+        platform['version'] = tuple(platform['version'])
+        return {'boot': row[0], 'os_version': row[1], 'facts': json.loads(row[2]),
+                'platform': platform}
+
+    def put(self, device, boot, os_version, facts, platform):
+        """Stores the facts and platform of device, booted at boot (epoch seconds)."""
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute('INSERT OR REPLACE INTO facts VALUES (?, ?, ?, ?, ?, ?)',
+                                   (device, boot, os_version, json.dumps(facts),
+                                    json.dumps(platform), time.time()))
+        finally:
+            connection.close()
+
+    def invalidate(self, device=None):
+        """Drops the entry of device, or every entry when no device is given."""
+        connection = self._connect()
+        try:
+            with connection:
+                if device is None:
+                    connection.execute('DELETE FROM facts')
+                else:
+                    connection.execute('DELETE FROM facts WHERE device = ?', (device,))
+        finally:
+            connection.close()
+
+    def is_current(self, entry, boot, os_version):
+        """True when a device booted at boot and running os_version still matches entry."""
+        return abs(entry['boot'] - boot) <= self.slack and entry['os_version'] == os_version
@@ -0,0 +1,189 @@
+"""Parsers for the interface show commands."""
+
+# Python3 support
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import re
+
+from napalm_ruckus_fastiron.utils.lines import iter_nlines
+
+PORT_RE = re.compile(r'(\d+/\d+/\d+|\d+/\d+|mgmt\d+)$')        # 1/1/1, 1/1 or mgmt1
+NOT_PHYSICAL = ('ve', 'lb', 'loopback', 'tunnel')
+VIRTUAL_NAMES = (('loopback', 'lb'), ('tunnel', 'tn'))      # show interface -> brief names
+
+BRIEF_COLUMNS = ('port', 'link', 'state', 'duplex', 'speed', 'trunk', 'tag', 'pvid', 'priority',
+                 'mac', 'name')
+DURATION_UNITS = {'day(s)': 86400, 'hour(s)': 3600, 'minute(s)': 60, 'second(s)': 1}
+SPEEDS = {
+    '10Mbit': 10,
+    '100Mbit': 100,
+    '1Gbit': 1000,
+    '2.5Gbit': 2500,
+    '5Gbit': 5000,
+    '10Gbit': 10000,
+    '25Gbit': 25000,
+    '40Gbit': 40000,
+    '100Gbit': 100000,
+}
+
+
+def virtual_name(name):
+    """Returns the show interface brief name of a virtual interface (Ve1 -> ve1)."""
+    name = name.lower()
+    for long_name, short_name in VIRTUAL_NAMES:
+        if name.startswith(long_name):
+            return short_name + name[len(long_name):]
+    return name
+
+
+def interface_header(line, virtual=False):
+    """Returns the port of a 'GigabitEthernet1/1/1 is up, ...' line, None for other lines.
+
+    Virtual interfaces are returned by their brief name when virtual is True, '' otherwise.
+    """
+    if line[:1].isspace() or ' is ' not in line:
+        return None
+    name = line.split(None, 1)[0]
+    if name.lower().startswith(NOT_PHYSICAL):   # virtual interfaces have no counters
+        return virtual_name(name) if virtual else ''
+    port = PORT_RE.search(name)
+    return port.group(1) if port else ''
+
+
+def _lines(output):
+    """Returns the lines of output, which is either the text or an iterable of its lines."""
+    return iter_nlines(output) if hasattr(output, 'splitlines') else output
+
+
+def iter_interface_blocks(output, virtual=False):
+    """Yields (port, lines) for every interface block of show interface, one block at a time.
+
+    output is the text of show interface or an iterable of its lines, blocks of virtual
+    interfaces (ve, loopback, tunnel) are skipped unless virtual is True.
+    """
+    port, block = None, list()
+    for line in _lines(output):
+        header = interface_header(line, virtual)
+        if header is None:
+            block.append(line)
+            continue
+        if port:
+            yield port, block
+        port, block = header, list()
+    if port:
+        yield port, block
+
+
+def new_counters():
+    return {
+        'tx_errors': 0,
+        'rx_errors': 0,
+        'tx_discards': None,                    # only reported by some platforms
+        'rx_discards': None,
+        'tx_octets': 0,
+        'rx_octets': 0,
+        'tx_unicast_packets': 0,
+        'rx_unicast_packets': 0,
+        'tx_multicast_packets': 0,
+        'rx_multicast_packets': 0,
+        'tx_broadcast_packets': 0,
+        'rx_broadcast_packets': 0,
+    }
+
+
+CAST_LINES = {'Received': 'rx_', 'Transmitted': 'tx_'}     # first word -> direction
+COUNTER_LINES = {                       # second and third words -> (counter, position of value)
+    ('packets', 'input'): ('rx_octets', 3),             # N packets input, N bytes, ...
+    ('packets', 'output'): ('tx_octets', 3),
+    ('input', 'errors'): ('rx_errors', 0),              # N input errors, N CRC, ...
+    ('output', 'errors'): ('tx_errors', 0),
+    ('input', 'discards'): ('rx_discards', 0),
+    ('output', 'discards'): ('tx_discards', 0),
+    ('Ingress', 'dropped'): ('rx_discards', 3),         # NP Ingress dropped N packets
+    ('Egress', 'dropped'): ('tx_discards', 3),
+}
+
+
+def _cast_packets(words, counters, prefix):
+    """Stores the counters of a 'Received|Transmitted N broadcasts, N multicasts, ...' line."""
+    for pos in range(2, len(words), 2):
+        kind = words[pos].rstrip(',')
+        if kind in ('broadcasts', 'multicasts', 'unicasts'):
+            counters[prefix + kind[:-1] + '_packets'] = int(words[pos - 1])
+
+
+def parse_counters(lines):
+    """Returns the counters found in the lines of one interface block."""
+    counters = new_counters()
+    for line in lines:
+        words = line.split()
+        if len(words) < 3:
+            continue
+        if words[0] in CAST_LINES:
+            _cast_packets(words, counters, CAST_LINES[words[0]])
+            continue
+        key, pos = COUNTER_LINES.get((words[1], words[2].rstrip(',')), (None, None))
+        if key is not None and pos < len(words):
+            counters[key] = int(words[pos])
+    return counters
+
+
+def iter_interface_counters(output):
+    """Yields (port, counters) for every physical port of show interface in a single pass."""
+    for port, lines in iter_interface_blocks(output):
+        yield port, parse_counters(lines)
+
+
+def iter_interface_brief(output):
+    """Yields (port, columns) for every row of show interface brief in a single pass.
+
+    columns is a dictionary with the link, state, duplex, speed, trunk, tag, pvid, priority, mac
+    and name of the port, the name being empty when it is not configured.
+    """
+    size = len(BRIEF_COLUMNS)
+    for line in _lines(output):
+        words = line.split(None, size - 1)      # the port name is the only free text column
+        if len(words) < size - 1 or words[0] == 'Port':
+            continue                            # headers and legend lines
+        if len(words) < size:
+            words.append('')
+        yield words[0], dict(zip(BRIEF_COLUMNS[1:], words[1:]))
+
+
+def parse_duration(words):
+    """Returns the seconds of a '1 day(s) 2 hour(s) 3 minute(s) 4 second(s)' list of words."""
+    seconds = 0
+    for pos in range(1, len(words)):
+        multiplier = DURATION_UNITS.get(words[pos])
+        if multiplier is not None:
+            seconds += int(words[pos - 1]) * multiplier
+    return seconds
+
+
+def parse_details(lines):
+    """Returns last_flapped, speed, mtu and description from the lines of one interface block."""
+    details = {'last_flapped': -1.0, 'speed': 0, 'mtu': -1, 'description': ''}
+    for line in lines:
+        words = line.split()
+        if not words:
+            continue
+        first = words[0]
+        if first == 'Port' and len(words) > 3 and words[2] == 'for':   # Port up for 2 day(s)..
+            details['last_flapped'] = float(parse_duration(words[3:]))
+        elif first == 'Port' and words[1:3] == ['name', 'is']:
+            details['description'] = line.split('Port name is', 1)[1].strip()
+        elif first == 'Configured' and 'actual' in words:
+            actual = words[words.index('actual') + 1].rstrip(',')
+            details['speed'] = SPEEDS.get(actual, 0)
+        elif 'MTU' in words:
+            mtu = words[words.index('MTU') + 1].rstrip(',')
+            if mtu.isdigit():
+                details['mtu'] = int(mtu)
+    return details
+
+
+def parse_interface_details(output):
+    """Returns a dictionary mapping every port and virtual interface to its details."""
+    return dict((port, parse_details(lines))
+                for port, lines in iter_interface_blocks(output, virtual=True))
@@ -0,0 +1,28 @@
+"""Line iteration helpers shared by the FastIron parsers."""
+
+# Python3 support
+from __future__ import print_function
+from __future__ import unicode_literals
+
+
+def iter_nlines(output):
+    """Yields the lines of output one at a time, skipping empty lines.
+
+    Runs in linear time and never copies more than the current line, so it can be consumed
+    lazily by parsers working on very large outputs. The last line is kept even when the output
+    does not end with a newline.
+    """
+    start = 0
+    size = len(output)
+    while start < size:
+        end = output.find('\n', start)          # position of the next line break
+        if end == -1:
+            end = size                          # last line without trailing newline
+        if end > start:                         # blank lines are skipped
+            yield output[start:end]
+        start = end + 1
+
+
+def list_of_nlines(output):
+    """Breaks a long string into a list of its non-empty lines."""
+    return [line for line in output.split('\n') if line]
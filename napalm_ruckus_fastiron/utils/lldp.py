@@ -0,0 +1,95 @@
+"""Parser for show lldp neighbors detail."""
+
+# Python3 support
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from napalm_ruckus_fastiron.utils.interfaces import _lines
+
+FIELDS = {                                          # detail field -> napalm key
+    'Chassis ID': 'remote_chassis_id',
+    'Port ID': 'remote_port',
+    'Port description': 'remote_port_description',
+    'System name': 'remote_system_name',
+    'System description': 'remote_system_description',
+    'System capabilities': 'remote_system_capab',
+    'Enabled capabilities': 'remote_system_enable_capab',
+}
+CAPABILITIES = ('remote_system_capab', 'remote_system_enable_capab')
+SECTIONS = ('Local port', 'Neighbor')             # lines starting a section or a neighbor
+
+
+def _field(line):
+    """Returns the (name, value) of a detail line, name being None for continuation lines."""
+    text = line.strip()
+    name, sep, value = text.lstrip('+').partition(':')
+    name = name.split('(')[0].strip()                   # Chassis ID (MAC address) -> Chassis ID
+    if sep and (text.startswith('+') or name in FIELDS or name in SECTIONS):
+        return name, value.strip()
+    return None, text
+
+
+def _neighbor(fields):
+    """Returns the NAPALM lldp_neighbors_detail dictionary of the fields of one neighbor."""
+    neighbor = {'parent_interface': ''}
+    for name, key in FIELDS.items():
+        value = fields.get(name, '').strip('"')
+        if key in CAPABILITIES:
+            value = [cap.strip() for cap in value.split(',') if cap.strip()]
+        neighbor[key] = value
+    return neighbor
+
+
+def _neighbor_lines(output):
+    """Yields (local port, [(name, value)]) with the _field() of the lines of every neighbor."""
+    port, block = None, None
+    for line in _lines(output):
+        field, value = _field(line)
+        if field in SECTIONS:
+            if block is not None:
+                yield port, block
+            if field == 'Local port':
+                port, block = value, None
+            else:
+                block = list()
+        elif block is not None:
+            block.append((field, value))
+        elif port is not None and field in FIELDS:      # section without a Neighbor line
+            block = [(field, value)]
+    if block is not None:                               # header or No neighbors lines otherwise
+        yield port, block
+
+
+def _join_fields(block):
+    """Returns the {name: value} of the fields of one neighbor, wrapped values joined back."""
+    fields, name = dict(), None
+    for field, value in block:
+        if field is not None:
+            fields[field] = value
+            name = field if field in FIELDS else None   # other fields are not kept
+        elif name is not None and value:                # continuation of a wrapped value
+            previous = fields[name]
+            if previous.endswith('\\'):
+                fields[name] = previous[:-1] + value
+            else:
+                fields[name] = previous + ' ' + value
+    return fields
+
+
+def iter_lldp_neighbors(output):
+    """Yields (local port, neighbor) for every neighbor of show lldp neighbors detail.
+
+    output is the text or an iterable of its lines, read in a single pass. A section starts at
+    every Local port line and may list several neighbors, values wrapped over several lines are
+    joined back together.
+    """
+    for port, block in _neighbor_lines(output):
+        yield port, _neighbor(_join_fields(block))
+
+
+def parse_lldp_neighbors(output):
+    """Returns the neighbors of show lldp neighbors detail as a {port: [neighbor]} dictionary."""
+    neighbors = dict()
+    for port, neighbor in iter_lldp_neighbors(output):
+        neighbors.setdefault(port, list()).append(neighbor)
+    return neighbors
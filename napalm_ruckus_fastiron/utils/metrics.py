@@ -0,0 +1,110 @@
+"""Opt-in instrumentation of the commands sent and the getters run by the driver."""
+
+# Python3 support
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import functools
+import threading
+import time
+
+from napalm_ruckus_fastiron.utils.cache import normalize_command
+
+
+def new_stats():
+    return {'count': 0, 'wall': 0.0, 'device_wait': 0.0, 'bytes': 0, 'lines': 0}
+
+
+def _add(stats, wall, wait, size, lines):
+    stats['count'] += 1
+    stats['wall'] += wall
+    stats['device_wait'] += wait
+    stats['bytes'] += size
+    stats['lines'] += lines
+
+
+class Instrumentation(object):
+    """Wall time, device wait, bytes and lines of every command and getter of a driver.
+
+    Disabled instances record nothing, so the driver only pays for an attribute lookup. hook is
+    called with one event dictionary per command and per getter, for export to other systems.
+    """
+
+    def __init__(self, enabled=False, hook=None):
+        self.enabled = bool(enabled or hook)            # a hook implies instrumentation
+        self.hook = hook
+        self._commands = dict()
+        self._getters = dict()
+        self._frames = threading.local()                # getters running in the thread
+        self._lock = threading.Lock()
+
+    def __running(self):
+        if not hasattr(self._frames, 'stack'):
+            self._frames.stack = list()
+        return self._frames.stack
+
+    def record_command(self, command, wall, wait, output):
+        """Stores one execution of command, wait being the time spent waiting for the device."""
+        self.record(command, wall, wait, len(output), output.count('\n'))
+
+    def record(self, command, wall, wait, size, lines):
+        """Stores one execution of command whose output had size bytes and lines lines."""
+        key = normalize_command(command)
+        with self._lock:
+            _add(self._commands.setdefault(key, new_stats()), wall, wait, size, lines)
+        for frame in self.__running():                  # nested getters share the command
+            frame['device_wait'] += wait
+            frame['bytes'] += size
+            frame['lines'] += lines
+        if self.hook is not None:
+            self.hook({'type': 'command', 'name': key, 'wall': wall, 'device_wait': wait,
+                       'bytes': size, 'lines': lines})
+
+    def wrap(self, name, getter):
+        """Returns getter recording its wall, device wait and parse time under name."""
+        @functools.wraps(getter)
+        def instrumented(*args, **kwargs):
+            frame = new_stats()
+            running = self.__running()
+            running.append(frame)
+            start = time.time()
+            try:
+                return getter(*args, **kwargs)
+            finally:
+                wall = time.time() - start
+                running.pop()
+                self.record_getter(name, wall, frame)
+        return instrumented
+
+    def record_getter(self, name, wall, frame):
+        """Stores one run of a getter, frame holding the device wait, bytes and lines."""
+        with self._lock:
+            stats = self._getters.get(name)
+            if stats is None:
+                stats = self._getters[name] = dict(new_stats(), parse=0.0)
+            _add(stats, wall, frame['device_wait'], frame['bytes'], frame['lines'])
+            stats['parse'] += max(wall - frame['device_wait'], 0.0)
+        if self.hook is not None:
+            self.hook({'type': 'getter', 'name': name, 'wall': wall,
+                       'device_wait': frame['device_wait'],
+                       'parse': max(wall - frame['device_wait'], 0.0),
+                       'bytes': frame['bytes'], 'lines': frame['lines']})
+
+    def instrument(self, driver):
+        """Replaces every public getter of driver with its instrumented version."""
+        for name in dir(type(driver)):
+            if name.startswith('get_') and callable(getattr(type(driver), name)):
+                setattr(driver, name, self.wrap(name, getattr(driver, name)))
+
+    def metrics(self):
+        """Returns the totals (seconds, bytes, lines) of every command and getter."""
+        with self._lock:
+            return {
+                'commands': dict((key, dict(stats)) for key, stats in self._commands.items()),
+                'getters': dict((key, dict(stats)) for key, stats in self._getters.items()),
+            }
+
+    def reset(self):
+        with self._lock:
+            self._commands.clear()
+            self._getters.clear()
@@ -0,0 +1,140 @@
+"""Registry of the record templates used to parse show commands.
+
+Every show command has one or more named templates, a regular expression whose named groups are
+the fields of one record. Templates are compiled on first use and can be registered for a given
+FastIron release, so a format change between releases is fixed by registering a new template.
+"""
+
+# Python3 support
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import re
+import threading
+
+from napalm_ruckus_fastiron.utils.cache import normalize_command
+
+
+class Template(object):
+    """Regular expression matching one record, its named groups being the fields.
+
+    casts maps a field to the callable converting its text, fields that did not match are None.
+    """
+
+    def __init__(self, pattern, casts=None, flags=re.MULTILINE):
+        self.pattern = pattern
+        self.casts = casts or dict()
+        self.flags = flags
+        self._regex = None
+
+    @property
+    def regex(self):
+        if self._regex is None:                         # compiled once, on first use
+            self._regex = re.compile(self.pattern, self.flags)
+        return self._regex
+
+    def record(self, match):
+        fields = match.groupdict()
+        for name, cast in self.casts.items():
+            if fields.get(name) is not None:
+                fields[name] = cast(fields[name])
+        return fields
+
+    def records(self, output):
+        """Yields the fields of every record found in output."""
+        for match in self.regex.finditer(output):
+            yield self.record(match)
+
+    def first(self, output):
+        """Returns the fields of the first record found in output, None if there is none."""
+        match = self.regex.search(output)
+        return self.record(match) if match else None
+
+
+class ParserRegistry(object):
+    """Maps (show command, record name) to the templates of the FastIron releases."""
+
+    def __init__(self):
+        self._templates = dict()                        # key -> [(since, Template)] newest first
+        self._lock = threading.Lock()
+
+    def register(self, command, name, pattern, casts=None, since=()):
+        """Registers the template of the name records of command, from release since onwards."""
+        key = (normalize_command(command), name)
+        with self._lock:
+            templates = self._templates.setdefault(key, list())
+            templates.append((tuple(since), Template(pattern, casts)))
+            templates.sort(key=lambda entry: entry[0], reverse=True)
+
+    def template(self, command, name, version=()):
+        """Returns the template for a device running version, the newest one if it is unknown."""
+        templates = self._templates.get((normalize_command(command), name))
+        if not templates:
+            raise KeyError('No template %r for %r' % (name, command))
+        if version:
+            for since, template in templates:
+                if since <= tuple(version):
+                    return template
+        return templates[0][1]
+
+    def parse(self, command, name, output, version=()):
+        """Returns the list of name records found in the output of command."""
+        return list(self.template(command, name, version).records(output))
+
+    def first(self, command, name, output, version=()):
+        """Returns the first name record found in the output of command, None if there is none."""
+        return self.template(command, name, version).first(output)
+
+
+REGISTRY = ParserRegistry()
+register = REGISTRY.register
+parse = REGISTRY.parse
+first = REGISTRY.first
+
+# show version
+register('show version', 'uptime', r'uptime is (?P<uptime>.+)$')
+
+# show chassis
+register('show chassis', 'fan', r'^\s*Fan (?P<fan>\d+) (?P<status>ok|failed)\b')
+register('show chassis', 'fanless', r'\bFanless\b')
+register('show chassis', 'temperature',
+         r'Current temperature\s*:\s*(?P<temperature>-?[\d.]+) deg-C \(Sensor (?P<sensor>\d+)\)',
+         casts={'temperature': float})
+register('show chassis', 'warning', r'Warning level\.*:\s*(?P<level>-?[\d.]+)',
+         casts={'level': float})
+register('show chassis', 'shutdown', r'Shutdown level\.*:\s*(?P<level>-?[\d.]+)',
+         casts={'level': float})
+register('show chassis', 'power_supply', r'^\s*Power supply (?P<psu>\d+)\b(?P<state>.*)$')
+
+# show inline power
+register('show inline power', 'capacity',
+         r'Total is (?P<total>\d+) mWatts\.\s+Current Free is (?P<free>\d+) mWatts',
+         casts={'total': int, 'free': int})
+
+# show cpu
+register('show cpu', 'busy', r'(?P<percent>\d+(?:\.\d+)?) percent busy',
+         casts={'percent': float})
+
+# show memory
+register('show memory', 'dynamic',
+         r'Dynamic memory: (?P<total>\d+) bytes total, (?P<free>\d+) bytes free',
+         casts={'total': int, 'free': int})
+
+# show lldp neighbors, one row per neighbor below the header
+register('show lldp neighbors', 'neighbor',
+         r'^(?P<local_port>\d+/\d+/\d+|mgmt\d+)\s+(?P<chassis_id>\S+)\s+(?P<port_id>\S+)'
+         r'(?:\s+(?P<port_description>.*?))?\s+(?P<system_name>\S+)[ \t]*$')
+
+# show ntp associations, flags being * synced, # selected, + candidate, - outlyer, x falseticker
+# and ~ configured. The legend below the table does not match
+register('show ntp associations', 'association',
+         r'^\s*(?P<flags>[*#+\-x~]*)(?P<address>[\d.:a-fA-F]+)\s+(?P<refid>\S+)\s+'
+         r'(?P<stratum>\d+)\s+(?P<when>\S+)\s+(?P<poll>\d+)\s+(?P<reach>\d+)\s+'
+         r'(?P<delay>-?[\d.]+)\s+(?P<offset>-?[\d.]+)\s+(?P<disp>-?[\d.]+)[ \t]*$',
+         casts={'stratum': int, 'poll': int, 'reach': int, 'delay': float, 'offset': float,
+                'disp': float})
+
+# show users
+register('show users', 'user',
+         r'^(?P<username>\S+)\s+(?P<password>\S+)\s+(?P<encrypt>enabled|disabled)\s+'
+         r'(?P<priv>\d+)\b', casts={'priv': int})
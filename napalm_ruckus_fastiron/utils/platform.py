@@ -0,0 +1,54 @@
+"""Platform capabilities probed from show version."""
+
+# Python3 support
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import re
+
+from napalm_ruckus_fastiron.utils.tokens import TokenizedOutput
+
+UNIT_RE = re.compile(r'UNIT (\d+):')
+VERSION_RE = re.compile(r'(\d+)\.(\d+)\.(\d+)')
+NO_VRF_MODELS = ('7150',)                       # ICX7150 does not support VRF
+VRF_MIN_VERSION = {'7250': (8, 0, 50)}          # models supporting VRF from a given release
+
+
+def parse_version(os_version):
+    """Returns the numeric part of a FastIron release (08.0.30eT213 -> (8, 0, 30))."""
+    match = VERSION_RE.search(os_version or '')
+    if match is None:
+        return ()
+    return tuple(int(number) for number in match.groups())
+
+
+def parse_platform(show_version):
+    """Returns the model, image type, version, stack size and VRF support of a device.
+
+    The image type is 'Switch' for the layer 2 (SPS) image and 'Router' otherwise.
+    """
+    tokens = TokenizedOutput.of(show_version)
+    model = tokens.value_at('Stackable', 1) or tokens.value_at('HW:', 1)
+    os_version = tokens.value_at('SW:', 2)
+    serial = (tokens.value_at('Serial', 1) or '').replace('#:', '')
+    if not serial:                              # 'Serial #: X' instead of 'Serial #:X'
+        serial = tokens.value_at('Serial', 2)
+    image_type = 'Switch' if 'SPS' in tokens.output else 'Router'
+    version = parse_version(os_version)
+
+    vrf_support = image_type == 'Router'
+    if model is not None and any(x in model for x in NO_VRF_MODELS):
+        vrf_support = False
+    for family, minimum in VRF_MIN_VERSION.items():
+        if model is not None and family in model and version <= minimum:
+            vrf_support = False
+
+    return {
+        'model': model,
+        'os_version': os_version,
+        'version': version,
+        'serial_number': serial,
+        'image_type': image_type,
+        'stack_size': len(set(UNIT_RE.findall(tokens.output))) or 1,
+        'vrf_support': vrf_support,
+    }
@@ -0,0 +1,135 @@
+"""Parsers for the MAC address and ARP tables."""
+
+# Python3 support
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import re
+
+ARP_HEADER = re.compile(r'IP Address|MAC Address|\S+')
+ARP_TITLES = {'IP Address': 'IP', 'MAC Address': 'MAC'}  # router image titles
+ARP_FIELDS = ('IP', 'MAC', 'Age', 'Port')
+
+
+class MacEntry(object):
+    """Compact MAC address table entry, an alternative to one dictionary per entry."""
+
+    __slots__ = ('mac', 'interface', 'vlan', 'static', 'active', 'moves', 'last_move')
+
+    def __init__(self, mac, interface, vlan, static, active, moves=-1, last_move=-1.0):
+        self.mac = mac
+        self.interface = interface
+        self.vlan = vlan
+        self.static = static
+        self.active = active
+        self.moves = moves
+        self.last_move = last_move
+
+    def to_dict(self):
+        return {
+            'mac': self.mac,
+            'interface': self.interface,
+            'vlan': self.vlan,
+            'static': self.static,
+            'active': self.active,
+            'moves': self.moves,
+            'last_move': self.last_move,
+        }
+
+
+def normalize_mac(mac):
+    """Returns mac in the FastIron notation (xxxx.xxxx.xxxx) whatever separators it uses."""
+    digits = ''.join(char for char in mac.lower() if char in '0123456789abcdef')
+    if len(digits) != 12:
+        return mac.lower()
+    return '.'.join((digits[0:4], digits[4:8], digits[8:12]))
+
+
+def iter_mac_entries(lines, compact=False, vlan=None, interface=None, address=None):
+    """Yields the entries of show mac-address one at a time from an iterable of lines.
+
+    Lines are consumed as they come, so memory does not grow with the size of the table. Entries
+    are dictionaries, or MacEntry records when compact is True. Columns are located from the
+    table header, and entries not matching the vlan, interface or address filters are skipped.
+    """
+    address = normalize_mac(address) if address else None
+    vlan = int(vlan) if vlan is not None else None
+    columns = None
+    for line in lines:
+        sentence = line.split()
+        if columns is None:                         # skips the totals above the table header
+            if 'MAC-Address' in sentence:
+                columns = dict((name, pos) for pos, name in enumerate(sentence))
+            continue
+        if len(sentence) < len(columns) or sentence[0] == 'MAC-Address':
+            continue
+
+        entry_vlan = int(sentence[columns['VLAN']]) if 'VLAN' in columns else vlan
+        if vlan is not None and entry_vlan != vlan:
+            continue
+        if interface is not None and sentence[columns['Port']] != interface:
+            continue
+        if address is not None and sentence[0] != address:
+            continue
+
+        action = sentence[columns['Action']] if 'Action' in columns else 'forward'
+        entry = MacEntry(mac=sentence[0],
+                         interface=sentence[columns['Port']],
+                         vlan=entry_vlan,
+                         static=sentence[columns['Type']] == 'Static',
+                         active=action == 'forward')
+        yield entry if compact else entry.to_dict()
+
+
+def _arp_columns(header):
+    """Returns the (start offset, name) of the columns of a show arp header line."""
+    return [(match.start(), ARP_TITLES.get(match.group(), match.group()))
+            for match in ARP_HEADER.finditer(header)]
+
+
+def _arp_row(line, columns):
+    """Returns the {column name: value} of a show arp line, placing every word in the column
+    whose header starts at or before it."""
+    row = dict()
+    for match in re.finditer(r'\S+', line):
+        name = columns[0][1]
+        for start, column in columns:
+            if start > match.start():
+                break
+            name = column
+        row[name] = row[name] + ' ' + match.group() if name in row else match.group()
+    return row
+
+
+def iter_arp_entries(lines, interface=None, address=None):
+    """Yields the entries of show arp one at a time from an iterable of lines.
+
+    Columns are located from the offsets of the header, which reads "IP MAC" on the switch image,
+    with a VLAN column, and "IP Address MAC Address" on the router image. Entries not matching
+    the interface or address filters are skipped.
+    """
+    columns = None
+    for line in lines:
+        line = line.expandtabs().rstrip()
+        if columns is None:
+            if 'IP' in line.split() and 'MAC' in line.split():
+                columns = _arp_columns(line)
+            continue
+        row = _arp_row(line, columns) if line else {}
+        if not row.get('No.', '').isdigit() or any(name not in row for name in ARP_FIELDS):
+            continue
+
+        port = row['Port']
+        ip = row['IP']
+        if interface is not None and port != interface:
+            continue
+        if address is not None and ip != address:
+            continue
+
+        age = row['Age']
+        yield {
+            'interface': port,
+            'mac': row['MAC'],
+            'ip': ip,
+            'age': float(age) if age.isdigit() else -1.0,   # static entries have no age
+        }
@@ -0,0 +1,49 @@
+"""Word index over the output of a show command."""
+
+# Python3 support
+from __future__ import print_function
+from __future__ import unicode_literals
+
+
+class TokenizedOutput(object):
+    """Splits an output once and indexes every word by the positions where it appears.
+
+    Lookups of the form "the word found at a relative offset of every occurrence of X" cost
+    O(occurrences of X) instead of a full scan of the output.
+    """
+
+    def __init__(self, output):
+        self.output = output
+        self.words = output.split()                 # breaks the output into words only once
+        self.index = dict()                         # word -> ordered list of positions
+        for position, word in enumerate(self.words):
+            self.index.setdefault(word, []).append(position)
+
+    @classmethod
+    def of(cls, output):
+        """Returns output unchanged if it is already tokenized, otherwise tokenizes it."""
+        if isinstance(output, cls):
+            return output
+        return cls(output)
+
+    def __contains__(self, word):
+        return word in self.index
+
+    def __len__(self):
+        return len(self.words)
+
+    def positions(self, word):
+        """Returns the positions of every occurrence of word."""
+        return self.index.get(word, [])
+
+    def values_at(self, word, offset):
+        """Returns the words found offset positions away from every occurrence of word."""
+        words = self.words
+        return [words[position + offset] for position in self.positions(word)]
+
+    def value_at(self, word, offset, default=None):
+        """Returns the word offset positions away from the first occurrence of word."""
+        positions = self.index.get(word)
+        if not positions:
+            return default
+        return self.words[positions[0] + offset]
@@ -0,0 +1,168 @@
+"""Time and peak memory of the getters against generated outputs of increasing size.
+
+    python test/benchmark/bench_getters.py [--scale 0.01,0.1,1] [--repeat 3]
+
+A scale of 1 is a 12 unit x 48 port stack with 100k MAC entries, 20k ARP entries and a 10k
+line running configuration, with an LLDP neighbor on every port. Comparing the rows of a getter
+across scales shows how it grows. The NTP associations and local users do not grow with the
+scale, a device only has a handful of them.
+"""
+
+# Python3 support
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import math
+import os
+import sys
+import time
+
+try:
+    import tracemalloc                                  # python >= 3.4
+except ImportError:
+    tracemalloc = None
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(HERE, '..', '..'), os.path.join(HERE, '..', 'unit')]
+
+from conftest import FakeFastIronDevice, PatchedFastIronDriver  # noqa
+
+import generators  # noqa
+
+FULL = {'units': 12, 'ports': 48, 'mac': 100000, 'arp': 20000, 'config': 10000, 'ntp': 8,
+        'users': 16}
+
+
+class GeneratedFastIronDevice(FakeFastIronDevice):
+    """FastIron device test double answering with generated outputs."""
+
+    def __init__(self, outputs):
+        super(GeneratedFastIronDevice, self).__init__()
+        self.outputs = outputs
+        self.received = 0                               # bytes returned so far
+
+    def send_command(self, command, **kwargs):
+        if command not in self.outputs:
+            raise IOError("Couldn't find generated output for: {}".format(command))
+        self.received += len(self.outputs[command])
+        return self.outputs[command]
+
+
+def sizes(scale):
+    """Returns the size of every generated output at scale (1 is FULL)."""
+    return {
+        'units': max(1, int(math.ceil(FULL['units'] * min(scale, 1.0)))),
+        'ports': FULL['ports'],
+        'mac': max(1, int(FULL['mac'] * scale)),
+        'arp': max(1, int(FULL['arp'] * scale)),
+        'config': max(10, int(FULL['config'] * scale)),
+        'ntp': FULL['ntp'],
+        'users': FULL['users'],
+    }
+
+
+def outputs(size):
+    """Returns the outputs of every show command sent by the benchmarked getters."""
+    units, per_unit = size['units'], size['ports']
+    return {
+        'show version': generators.show_version(units),
+        'show interface brief': generators.show_interface_brief(units, per_unit),
+        'show interface': generators.show_interface(units, per_unit),
+        'show running | i hostname': 'hostname bench-stack\n',
+        'show mac-address all': generators.show_mac_address(size['mac'], units, per_unit),
+        'show arp': generators.show_arp(size['arp']),
+        'show running-config': generators.running_config(size['config']),
+        'show chassis': generators.show_chassis(units),
+        'show cpu': generators.show_cpu(units),
+        'show memory': generators.show_memory(units),
+        'show inline power': generators.show_inline_power(units, per_unit),
+        'show lldp neighbors': generators.show_lldp_neighbors(units, per_unit),
+        'show lldp neighbors detail': generators.show_lldp_neighbors_detail(units, per_unit),
+        'show ntp associations': generators.show_ntp_associations(size['ntp']),
+        'show users': generators.show_users(size['users']),
+    }
+
+
+def _compare_config(driver, data):
+    driver.load_replace_candidate(
+        config=generators.candidate_config(data['show running-config']))
+    return driver.compare_config()
+
+
+CASES = [
+    ('get_facts', 'units', lambda driver, data: driver.get_facts()),
+    ('get_interfaces', 'units', lambda driver, data: driver.get_interfaces()),
+    ('get_interfaces_counters', 'units', lambda driver, data: driver.get_interfaces_counters()),
+    ('get_mac_address_table', 'mac', lambda driver, data: driver.get_mac_address_table()),
+    ('get_arp_table', 'arp', lambda driver, data: driver.get_arp_table()),
+    ('get_environment', 'units', lambda driver, data: driver.get_environment()),
+    ('get_lldp_neighbors', 'units', lambda driver, data: driver.get_lldp_neighbors()),
+    ('get_lldp_neighbors_detail', 'units',
+     lambda driver, data: driver.get_lldp_neighbors_detail()),
+    ('get_ntp_servers', 'ntp', lambda driver, data: driver.get_ntp_servers()),
+    ('get_ntp_peers', 'ntp', lambda driver, data: driver.get_ntp_peers()),
+    ('get_ntp_stats', 'ntp', lambda driver, data: driver.get_ntp_stats()),
+    ('get_users', 'users', lambda driver, data: driver.get_users()),
+    ('compare_config', 'config', _compare_config),
+]
+
+
+def build_driver(data):
+    driver = PatchedFastIronDriver('bench', 'admin', 'admin')
+    driver.device = GeneratedFastIronDevice(data)
+    return driver
+
+
+def measure(run, driver, data, repeat):
+    """Returns the best time (seconds), the peak memory (bytes, None if unknown) and the bytes
+    of output parsed by one run."""
+    driver.device.received = 0
+    best = None
+    for __ in range(repeat):
+        start = time.time()
+        run(driver, data)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    received = driver.device.received // repeat
+
+    peak = None
+    if tracemalloc is not None:                         # separate run, tracing slows it down
+        tracemalloc.start()
+        run(driver, data)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak, received
+
+
+def run_benchmark(scales, repeat=3, report=print):
+    """Measures every case at every scale and reports one row per getter and input size.
+
+    Returns a list of (getter, size, input bytes, seconds, peak bytes) rows.
+    """
+    rows = []
+    report('%-26s %10s %12s %10s %12s' % ('getter', 'size', 'input KB', 'ms', 'peak KB'))
+    for scale in scales:
+        size = sizes(scale)
+        data = outputs(size)
+        for name, dimension, run in CASES:
+            driver = build_driver(data)
+            seconds, peak, input_bytes = measure(run, driver, data, repeat)
+            rows.append((name, size[dimension], input_bytes, seconds, peak))
+            report('%-26s %10d %12d %10.1f %12s' % (
+                name, size[dimension], input_bytes // 1024, seconds * 1000,
+                'n/a' if peak is None else peak // 1024))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', default='0.01,0.1,1',
+                        help='comma separated fractions of the full size (default 0.01,0.1,1)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measure (default 3)')
+    args = parser.parse_args(argv)
+    run_benchmark([float(scale) for scale in args.scale.split(',')], args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Import time of the package modules, each measured in a fresh interpreter.
+
+    python test/benchmark/bench_import.py [--repeat 5]
+
+The heavy column lists the transport and napalm packages a module pulls in, the parser
+modules of napalm_ruckus_fastiron.utils should not pull in any.
+"""
+
+# Python3 support
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+HEAVY = ('napalm', 'netmiko', 'paramiko', 'pkg_resources')
+MODULES = [
+    'napalm_ruckus_fastiron',
+    'napalm_ruckus_fastiron.utils.tables',
+    'napalm_ruckus_fastiron.utils.interfaces',
+    'napalm_ruckus_fastiron.utils.config',
+    'napalm_ruckus_fastiron.utils.platform',
+    'napalm_ruckus_fastiron.utils.parsers',
+    'napalm_ruckus_fastiron.FastIron',
+    'napalm_ruckus_fastiron.fleet',
+]
+SCRIPT = '''
+import sys, time
+start = time.time()
+import {module}
+elapsed = time.time() - start
+print(elapsed, ','.join(name for name in {heavy!r} if name in sys.modules))
+'''
+
+
+def time_import(module, repeat=5):
+    """Returns the best import time (seconds) of module and the heavy packages it loads."""
+    best, heavy = None, ''
+    for __ in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c',
+                                          SCRIPT.format(module=module, heavy=HEAVY)], cwd=ROOT)
+        words = output.decode('utf-8').split()
+        elapsed = float(words[0])
+        heavy = words[1] if len(words) > 1 else ''
+        best = elapsed if best is None else min(best, elapsed)
+    return best, heavy
+
+
+def run_benchmark(modules=MODULES, repeat=5, report=print):
+    """Reports one row per module and returns a list of (module, seconds, heavy) rows."""
+    rows = []
+    report('%-42s %10s  %s' % ('module', 'ms', 'heavy'))
+    for module in modules:
+        seconds, heavy = time_import(module, repeat)
+        rows.append((module, seconds, heavy))
+        report('%-42s %10.1f  %s' % (module, seconds * 1000, heavy or '-'))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='imports per module (default 5)')
+    args = parser.parse_args(argv)
+    run_benchmark(repeat=args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""End to end timings of driver sessions against simulated devices.
+
+    python test/benchmark/bench_session.py [--devices 1] [--latency 0.05] [--throughput 100000]
+
+With a single device every step of a session is timed: open(), the getters, commit_config()
+and close(). With more devices the getters are run on all of them with run_fleet and the
+spread of the per device times is reported.
+"""
+
+# Python3 support
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', '..'))
+
+from napalm_ruckus_fastiron import FastIronDriver, run_fleet  # noqa
+
+from simulator import FastIronSimulator  # noqa
+
+GETTERS = ['get_facts', 'get_interfaces', 'get_interfaces_counters', 'get_arp_table']
+MERGE = 'interface ethernet 1/1/1\n port-name bench\n'
+
+
+def time_session(device, getters=GETTERS, commit=True, report=print, **optional_args):
+    """Returns the (step, seconds) of one session opened on a SimulatedDevice."""
+    driver = FastIronDriver('127.0.0.1', device.username, device.password,
+                            optional_args=dict(optional_args, port=device.port))
+    steps = [('open', driver.open)]
+    steps += [(getter, getattr(driver, getter)) for getter in getters]
+    if commit:
+        steps.append(('commit_config', lambda: (driver.load_merge_candidate(config=MERGE),
+                                                driver.commit_config())))
+    steps.append(('close', driver.close))
+
+    timings = []
+    for name, step in steps:
+        start = time.time()
+        step()
+        timings.append((name, time.time() - start))
+        report('%-24s %10.1f ms' % (name, timings[-1][1] * 1000))
+    return timings
+
+
+def time_fleet(simulator, getters=GETTERS, workers=32, report=print, **optional_args):
+    """Returns the total seconds and the per device results of a run_fleet poll."""
+    start = time.time()
+    results = list(run_fleet(simulator.inventory(**optional_args), getters, max_workers=workers))
+    total = time.time() - start
+
+    elapsed = sorted(result.elapsed for result in results)
+    failed = [result for result in results if not result.ok]
+    report('%d devices, %d workers: %.1f s total, per device min %.1f s, median %.1f s, max '
+           '%.1f s, %d failed' % (len(results), workers, total, elapsed[0],
+                                  elapsed[len(elapsed) // 2], elapsed[-1], len(failed)))
+    return total, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--devices', type=int, default=1, help='devices to simulate (1)')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds per command (0)')
+    parser.add_argument('--throughput', type=int, default=None, help='bytes per second (none)')
+    parser.add_argument('--workers', type=int, default=32, help='run_fleet workers (32)')
+    args = parser.parse_args(argv)
+
+    with FastIronSimulator(args.devices, latency=args.latency,
+                           throughput=args.throughput) as simulator:
+        if args.devices == 1:
+            time_session(simulator.devices[0])
+        else:
+            time_fleet(simulator, workers=args.workers)
+
+
+if __name__ == '__main__':
+    main()
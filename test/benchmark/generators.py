@@ -0,0 +1,245 @@
+"""Generators of large, realistic FastIron show outputs."""
+
+# Python3 support
+from __future__ import print_function
+from __future__ import unicode_literals
+
+MODEL = 'ICX7250-48P'
+
+
+def _mac(number, prefix=0xcc4e):
+    return '%04x.%04x.%04x' % (prefix, (number >> 16) & 0xffff, number & 0xffff)
+
+
+def ports(units, per_unit):
+    """Returns the 1/1/1 style names of every port of a stack."""
+    return ['%d/1/%d' % (unit, port) for unit in range(1, units + 1)
+            for port in range(1, per_unit + 1)]
+
+
+def show_version(units):
+    lines = [
+        '  Copyright (c) 1996-2016 Brocade Communications Systems, Inc. All rights reserved.',
+        '    UNIT 1: compiled on Jun 21 2016 at 05:19:47 labeled as SPR08030e',
+        '      (10391580 bytes) from Primary SPR08030e.bin',
+        '        SW: Version 08.0.30eT213',
+        '  HW: Stackable %s' % MODEL,
+    ]
+    for unit in range(1, units + 1):
+        lines += [
+            '=' * 74,
+            'UNIT %d: SL 1: %s POE 48-port Management Module' % (unit, MODEL),
+            '         Serial  #:DUK38%05dS' % unit,
+            '         Current License: l3-prem-8X10G',
+        ]
+    lines += [
+        '=' * 74,
+        'STACKID 1  system uptime is 2 day(s) 3 hour(s) 29 minute(s) 38 second(s)',
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def show_interface_brief(units, per_unit):
+    lines = ['', 'Port       Link    State   Dupl Speed Trunk Tag Pvid Pri MAC             Name']
+    for number, port in enumerate(ports(units, per_unit)):
+        if number % 3:
+            lines.append('%-10s Down    None    None None  None  No  1    0   %s' %
+                         (port, _mac(number)))
+        else:
+            lines.append('%-10s Up      Forward Full 1G    None  No  1    0   %s  link%d' %
+                         (port, _mac(number), number))
+    return '\n'.join(lines) + '\n'
+
+
+def show_interface(units, per_unit):
+    lines = []
+    for number, port in enumerate(ports(units, per_unit)):
+        mac = _mac(number)
+        lines += [
+            'GigabitEthernet%s is up, line protocol is up' % port,
+            '  Port up for 1 day(s) 2 hour(s) 3 minute(s) %d second(s)' % (number % 60),
+            '  Hardware is GigabitEthernet, address is %s (bia %s)' % (mac, mac),
+            '  Configured speed auto, actual 1Gbit, configured duplex fdx, actual fdx',
+            '  Port name is link%d' % number,
+            '  MTU 1500 bytes, encapsulation ethernet',
+            '  300 second input rate: 1000 bits/sec, 1 packets/sec, 0.00% utilization',
+            '  300 second output rate: 2000 bits/sec, 2 packets/sec, 0.00% utilization',
+            '  %d packets input, %d bytes, 0 no buffer' % (number * 10, number * 640),
+            '  Received 10 broadcasts, 20 multicasts, %d unicasts' % number,
+            '  1 input errors, 2 CRC, 3 frame, 4 ignored',
+            '  5 runts, 6 giants',
+            '  %d packets output, %d bytes, 0 underruns' % (number * 20, number * 1280),
+            '  Transmitted 30 broadcasts, 40 multicasts, %d unicasts' % number,
+            '  7 output errors, 8 collisions',
+        ]
+    return '\n'.join(lines) + '\n'
+
+
+def show_mac_address(entries, units=12, per_unit=48):
+    names = ports(units, per_unit)
+    lines = [
+        'Total active entries from all ports = %d' % entries,
+        'Total static entries from all ports = 0',
+        '  MAC-Address    Port     Type   VLAN\tAction',
+    ]
+    for number in range(entries):
+        lines.append('%s %-8s Dynamic %6d\tforward' % (_mac(number, 0x0000),
+                                                       names[number % len(names)],
+                                                       1 + number % 4000))
+    return '\n'.join(lines) + '\n'
+
+
+def show_arp(entries):
+    lines = [
+        'All ARPs: %d, maximum capacity: 65536' % entries,
+        'No.   IP              MAC            Type     Age Port           Status VLAN',
+    ]
+    for number in range(entries):
+        ip = '10.%d.%d.%d' % (number >> 16 & 0xff, number >> 8 & 0xff, number & 0xff)
+        lines.append('%-5d %-15s %s Dynamic  %-3d 1/1/%-12d Valid  %d' %
+                     (number + 1, ip, _mac(number), number % 10, 1 + number % 48,
+                      1 + number % 4000))
+    return '\n'.join(lines) + '\n'
+
+
+def show_chassis(units):
+    lines = []
+    for unit in range(1, units + 1):
+        lines += [
+            'The stack unit %d chassis info:' % unit,
+            '',
+            'Power supply 1 (AC - Regular) present, status ok',
+            'Power supply 2 not present',
+            '',
+            'Fan 1 ok, speed (auto): [[1]]<->2',
+            '',
+            'Fan controlled temperature: 53.5 deg-C',
+            '',
+            'Fan speed switching temperature thresholds:',
+            '                Speed 1: NM<----->68       deg-C',
+            '                Speed 2:        61<-----> 85 deg-C (shutdown)',
+            '',
+            'Fan 1 Air Flow Direction:  Front to Back',
+            'MAC 1 Temperature Readings:',
+            '        Current temperature : 52.5 deg-C (Sensor 1)',
+            'Sensor B Temperature Readings:',
+            '        Current temperature : 36.0 deg-C (Sensor 2)',
+            'Warning level.......: 80.0 deg-C',
+            'Shutdown level......: 85.0 deg-C',
+            '',
+        ]
+    return '\n'.join(lines) + '\n'
+
+
+def show_cpu(units):
+    lines = []
+    for unit in range(1, units + 1):
+        lines += ['Unit %d:' % unit, '%d percent busy, from 3 sec ago' % (unit % 10),
+                  '1   sec avg:  1 percent busy', '5   sec avg:  1 percent busy']
+    return '\n'.join(lines) + '\n'
+
+
+def show_memory(units):
+    lines = []
+    for unit in range(1, units + 1):
+        lines += ['Stack unit %d:' % unit,
+                  'Total DRAM: 1073741824 bytes',
+                  '  Dynamic memory: 1020387328 bytes total, 654434304 bytes free, 35% used']
+    return '\n'.join(lines) + '\n'
+
+
+def show_inline_power(units, per_unit):
+    lines = []
+    for unit in range(1, units + 1):
+        lines += [
+            '',
+            'Power Capacity:         Total is 740000 mWatts. Current Free is 713200 mWatts.',
+            '',
+            ' Port   Admin   Oper    ---Power(mWatts)---  PD Type  PD Class  Pri  Fault/',
+            '        State   State   Consumed  Allocated                          Error',
+            '-' * 78,
+        ]
+        for port in range(1, per_unit + 1):
+            lines.append(' %d/1/%-2d On      Off          0          0  n/a      n/a       3    '
+                         'n/a' % (unit, port))
+    return '\n'.join(lines) + '\n'
+
+
+def show_lldp_neighbors(units, per_unit):
+    lines = ['Lcl Port Chassis ID      Port ID         Port Description                System Name']
+    for number, port in enumerate(ports(units, per_unit)):
+        lines.append('%-8s %s  %s  GigabitEthernet%-16s sw%d' % (
+            port, _mac(number, 0x0c4e), _mac(number, 0x0c4e), port, number))
+    return '\n'.join(lines) + '\n'
+
+
+def show_lldp_neighbors_detail(units, per_unit):
+    lines = []
+    for number, port in enumerate(ports(units, per_unit)):
+        lines += [
+            'Local port: %s' % port,
+            '  Neighbor: %s, TTL 101 seconds' % _mac(number, 0x0c4e),
+            '    + Chassis ID (MAC address): %s' % _mac(number, 0x0c4e),
+            '    + Port ID (interface name): ethernet%s' % port,
+            '    + Time to live: 120 seconds',
+            '    + System name         : "sw%d"' % number,
+            '    + Port description    : "GigabitEthernet%s"' % port,
+            '    + System description  : "Ruckus Wireless, Inc. %s, IronWare Version '
+            '08.0.3\\' % MODEL,
+            '                             0eT213 compiled on Jun 21 2016"',
+            '    + System capabilities : bridge, router',
+            '      Enabled capabilities: bridge',
+            '    + Management address (IPv4): 10.0.%d.%d' % (number >> 8 & 0xff, number & 0xff),
+            '',
+        ]
+    return '\n'.join(lines) + '\n'
+
+
+def show_ntp_associations(servers):
+    lines = ['     address         ref clock       st  when  poll reach  delay  offset   disp']
+    for number in range(servers):
+        address = '10.0.%d.%d' % ((number + 1) >> 8 & 0xff, (number + 1) & 0xff)
+        lines.append('%s~%-17s 172.24.38.63      3    25    64  377   1.45  -0.107   0.274' %
+                     ('*' if number == 0 else ' ', address))
+    lines.append(' * synced, # selected, + candidate, - outlayer, x falseticker, ~ configured')
+    return '\n'.join(lines) + '\n'
+
+
+def show_users(users):
+    lines = ['Username    Password                 Encrypt  Priv  Status    Expire Time',
+             '=' * 78]
+    for number in range(users):
+        lines.append('user%-7d $1$Gz.rUdSx$%07dHydMBV  enabled  %d     enabled   Never' %
+                     (number, number, (0, 4, 5)[number % 3]))
+    return '\n'.join(lines) + '\n'
+
+
+def running_config(lines):
+    """Returns a running configuration of about lines lines."""
+    config = ['Current configuration:', '!', 'ver 08.0.30eT213', '!', 'hostname bench-stack', '!']
+    number = 0
+    while len(config) < lines:
+        unit, port = divmod(number, 48)
+        config += [
+            'interface ethernet %d/1/%d' % (unit % 12 + 1, port + 1),
+            ' port-name link%d' % number,
+            ' speed-duplex 1000-full',
+            '!',
+        ]
+        if number % 4 == 0:
+            config += ['vlan %d by port' % (number + 10),
+                       ' tagged ethe %d/1/%d' % (unit % 12 + 1, port + 1), '!']
+        number += 1
+    return '\n'.join(config + ['end']) + '\n'
+
+
+def candidate_config(running, every=50):
+    """Returns running with the port name of one interface out of every changed."""
+    lines = running.splitlines()[1:]                    # no 'Current configuration:' banner
+    changed = 0
+    for pos, line in enumerate(lines):
+        if line.startswith(' port-name'):
+            if changed % every == 0:
+                lines[pos] = line + '-new'
+            changed += 1
+    return '\n'.join(lines) + '\n'
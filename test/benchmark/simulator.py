@@ -0,0 +1,412 @@
+"""Local SSH stand-in for FastIron devices.
+
+    python test/benchmark/simulator.py [--devices 10] [--latency 0.05] [--throughput 100000]
+
+Every simulated device listens on its own port of 127.0.0.1 and emulates the FastIron CLI: the
+SSH@hostname prompt, enable, skip-page-display and the --More-- pager, configure terminal and
+canned show outputs. The canned outputs are the mocked_data fixtures of the unit tests, plus
+generated show version, interface and running-config outputs. A per command latency and a
+throughput limit make the round trips of open(), the getters and commit_config measurable.
+"""
+
+# Python3 support
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import collections
+import glob
+import os
+import re
+import socket
+import threading
+import time
+
+import paramiko
+
+import generators
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MOCKED_DATA = os.path.join(HERE, '..', 'unit', 'mocked_data')
+MORE = '--More--, next page: Space, next line: Return key, quit: Control-c'
+INVALID = 'Invalid input -> %s\r\nType ? for a list'
+
+_host_key = []                                          # generated once, shared by all devices
+
+
+def host_key():
+    if not _host_key:
+        _host_key.append(paramiko.RSAKey.generate(2048))
+    return _host_key[0]
+
+
+def sanitize(command):
+    """Returns the fixture name of command, as the FakeFastIronDevice test double does."""
+    return re.sub('[^a-zA-Z0-9]', '_', ' '.join(command.split()))[0:150]
+
+
+def load_fixtures(path=MOCKED_DATA):
+    """Returns the sanitized command -> output of every mocked_data fixture."""
+    outputs = dict()
+    for filename in glob.glob(os.path.join(path, '*', 'normal', '*.text')):
+        with open(filename) as data_file:
+            outputs[os.path.basename(filename)[:-len('.text')]] = data_file.read()
+    return outputs
+
+
+def default_outputs(units=1, per_unit=48):
+    """Returns the canned outputs of a simulated units x per_unit ports stack."""
+    outputs = load_fixtures()
+    outputs.update({
+        sanitize('show version'): generators.show_version(units),
+        sanitize('show interface brief'): generators.show_interface_brief(units, per_unit),
+        sanitize('show interface'): generators.show_interface(units, per_unit),
+    })
+    return outputs
+
+
+class FastIronCLI(object):
+    """FastIron command line state: mode, paging and running configuration.
+
+    execute() takes one line typed by the user and returns the text to print before the next
+    prompt. outputs maps sanitized commands to their output.
+    """
+
+    def __init__(self, hostname, outputs, config_lines=200, page_length=24):
+        self.hostname = hostname
+        self.outputs = outputs
+        self.mode = 'exec'                              # exec, password, enable or config
+        self.context = False                            # inside an interface, vlan... context
+        self.paging = True
+        self.page_length = page_length
+        self.running = [('hostname ' + hostname) if line.startswith('hostname ') else line
+                        for line in generators.running_config(config_lines).splitlines()[1:-1]]
+
+    def prompt(self):
+        if self.mode == 'password':
+            return 'Password:'
+        suffix = {'exec': '>', 'enable': '#', 'config': '(config)#'}[self.mode]
+        return 'SSH@%s%s' % (self.hostname, suffix)
+
+    def pages(self, output):
+        """Splits output in the pages shown between --More-- prompts."""
+        lines = output.splitlines()
+        if not self.paging or len(lines) <= self.page_length:
+            return [output]
+        return ['\r\n'.join(lines[pos:pos + self.page_length])
+                for pos in range(0, len(lines), self.page_length)]
+
+    def execute(self, line):
+        if self.mode == 'password':                     # any enable password is accepted
+            self.mode = 'enable'
+            return ''
+        command = ' '.join(line.split())
+        words = command.split()
+        if not words:
+            return ''
+        if self.mode == 'config':
+            return self.configure(command)
+
+        if command in ('enable', 'en'):
+            self.mode = 'password' if self.mode == 'exec' else self.mode
+            return ''
+        if command == 'skip-page-display':
+            self.paging = False
+            return 'Disable page display mode'
+        if len(words) == 2 and 'configure'.startswith(words[0]) and len(words[0]) > 3 and \
+                'terminal'.startswith(words[1]) and self.mode == 'enable':    # conf t, config term
+            self.mode = 'config'
+            return ''
+        if words[0] == 'write' and self.mode == 'enable':
+            return 'Write startup-config done.'
+        if words[0] in ('show', 'sh'):
+            return self.show(command)
+        return INVALID % command
+
+    def show(self, command):
+        if command in ('show running-config', 'show running', 'sh run'):
+            return '\r\n'.join(['Current configuration:'] + self.running + ['end'])
+        if command.startswith('show running | i '):
+            word = command[len('show running | i '):]
+            return '\r\n'.join(line for line in self.running if word in line)
+        command, pipe, output_filter = command.partition(' | ')
+        output = self.outputs.get(sanitize(command))
+        if output is not None and pipe and output_filter.split()[0] in ('i', 'include'):
+            word = output_filter.split(None, 1)[1]
+            output = '\n'.join(line for line in output.splitlines() if word in line)
+        if output is None:
+            return INVALID % command
+        return output.replace('\r\n', '\n').replace('\n', '\r\n').rstrip('\r\n')
+
+    def configure(self, command):
+        if command == 'exit' and self.context:          # back to the global configuration
+            self.context = False
+        elif command in ('end', 'exit'):
+            self.mode = 'enable'
+            self.context = False
+        elif command.startswith('no '):
+            self.running = [line for line in self.running if line.strip() != command[3:]]
+        else:
+            self.running.append(command)
+            self.context = self.context or command.startswith(('interface ', 'vlan ', 'router '))
+        return ''
+
+
+class DeviceServer(paramiko.ServerInterface):
+    """Accepts the password login and up to max_channels interactive shells of one SSH session."""
+
+    def __init__(self, username, password, max_channels=1):
+        self.username = username
+        self.password = password
+        self.max_channels = max_channels
+        self.channels = 0
+        self.shells = collections.defaultdict(threading.Event)     # channel id -> shell started
+
+    def check_auth_password(self, username, password):
+        if (username, password) == (self.username, self.password):
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def get_allowed_auths(self, username):
+        return 'password'
+
+    def check_channel_request(self, kind, chanid):
+        if kind == 'session' and self.channels < self.max_channels:
+            self.channels += 1
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_pty_request(self, *args):
+        return True
+
+    def check_channel_shell_request(self, channel):
+        self.shells[channel.get_id()].set()
+        return True
+
+
+class SimulatedDevice(object):
+    """One simulated FastIron device listening on 127.0.0.1:port (0 picks a free port).
+
+    latency is the seconds waited before answering a command, either a number or a dictionary
+    of command -> seconds with an optional None default. throughput limits the bytes per second
+    of the answers. max_channels is the number of shells accepted per SSH session.
+    """
+
+    def __init__(self, hostname='ICX7250-sim', outputs=None, username='admin', password='admin',
+                 port=0, latency=0.0, throughput=None, chunk=4096, max_channels=1):
+        self.hostname = hostname
+        self.outputs = default_outputs() if outputs is None else outputs
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.throughput = throughput
+        self.chunk = chunk
+        self.max_channels = max_channels
+        self.commands = list()                          # every line received, in order
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind(('127.0.0.1', port))
+        self.port = self._socket.getsockname()[1]
+        self._running = False
+
+    def start(self):
+        host_key()
+        self._socket.listen(16)
+        self._running = True
+        thread = threading.Thread(target=self._accept)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        self._socket.close()
+
+    def _accept(self):
+        while self._running:
+            try:
+                client, __ = self._socket.accept()
+            except (socket.error, OSError):             # closed by stop()
+                return
+            thread = threading.Thread(target=self._session, args=(client,))
+            thread.daemon = True
+            thread.start()
+
+    def _delay(self, command):
+        if isinstance(self.latency, dict):
+            return self.latency.get(command, self.latency.get(None, 0.0))
+        return self.latency
+
+    def _send(self, channel, text):
+        data = text.encode('utf-8')
+        if not self.throughput:
+            channel.sendall(data)
+            return
+        for pos in range(0, len(data), self.chunk):
+            channel.sendall(data[pos:pos + self.chunk])
+            time.sleep(float(len(data[pos:pos + self.chunk])) / self.throughput)
+
+    def _session(self, client):
+        transport = paramiko.Transport(client)
+        transport.add_server_key(host_key())
+        server = DeviceServer(self.username, self.password, self.max_channels)
+        try:
+            transport.start_server(server=server)
+            channel = transport.accept(20)
+            if channel is None:
+                return
+            if self.max_channels > 1:
+                thread = threading.Thread(target=self._accept_channels, args=(transport, server))
+                thread.daemon = True
+                thread.start()
+            self._channel(channel, server)
+        except (socket.error, EOFError, paramiko.SSHException):
+            pass
+        finally:
+            transport.close()                           # the first shell ends the session
+
+    def _accept_channels(self, transport, server):
+        while transport.is_active():
+            channel = transport.accept(1)
+            if channel is not None:
+                thread = threading.Thread(target=self._channel, args=(channel, server))
+                thread.daemon = True
+                thread.start()
+
+    def _channel(self, channel, server):
+        try:
+            if server.shells[channel.get_id()].wait(10):
+                self._shell(channel, FastIronCLI(self.hostname, self.outputs))
+        except (socket.error, EOFError, paramiko.SSHException):
+            pass
+
+    def _shell(self, channel, cli):
+        self._send(channel, '\r\n' + cli.prompt())
+        session = ShellSession(self, channel, cli)
+        while True:
+            data = channel.recv(1024)
+            if not data:
+                return
+            for char in data.decode('utf-8', 'replace'):
+                if not session.feed(char):
+                    return
+
+
+class ShellSession(object):
+    """Line being typed and pages left to show of one shell of a SimulatedDevice.
+
+    Every character received is handled by the pager while a --More-- prompt is waiting, by the
+    handler of its character otherwise.
+    """
+
+    def __init__(self, device, channel, cli):
+        self.device = device
+        self.channel = channel
+        self.cli = cli
+        self.line, self.pending, self.previous = '', [], ''
+        self.handlers = {'\r': self._end_of_line, '\n': self._end_of_line}
+
+    def feed(self, char):
+        """Handles one character, returns False once the shell is closed."""
+        handler = self._more if self.pending else self.handlers.get(char, self._typed)
+        alive = handler(char)
+        self.previous = char
+        return alive
+
+    def _send(self, text):
+        self.device._send(self.channel, text)
+
+    def _more(self, char):
+        if char in ('q', '\x03'):
+            self.pending = []
+        else:
+            self._send('\r' + ' ' * len(MORE) + '\r' + self.pending.pop(0))
+        if self.pending:
+            self._send('\r\n' + MORE)
+        else:
+            self._send('\r\n' + self.cli.prompt())
+        return True
+
+    def _typed(self, char):
+        self.line += char
+        if self.cli.mode != 'password':
+            self._send(char)                            # echoes what is typed
+        return True
+
+    def _end_of_line(self, char):
+        if char == '\n' and self.previous == '\r':     # \r\n is a single end of line
+            return True
+        line, self.line = self.line, ''
+        self.device.commands.append(line)
+        self._send('\r\n')
+        command = ' '.join(line.split())
+        if command in ('exit', 'logout') and self.cli.mode != 'config':
+            return False
+        time.sleep(self.device._delay(command))
+        pages = self.cli.pages(self.cli.execute(line))
+        first = pages.pop(0)
+        if pages:
+            self.pending = pages
+            self._send(first + '\r\n' + MORE)
+        else:
+            self._send(first + ('\r\n' if first else '') + self.cli.prompt())
+        return True
+
+
+class FastIronSimulator(object):
+    """Starts count simulated devices, as a context manager.
+
+    Keyword arguments are passed to every SimulatedDevice, hostnames are prefix-1, prefix-2...
+    """
+
+    def __init__(self, count=1, prefix='ICX7250-sim', **kwargs):
+        self.devices = [SimulatedDevice(hostname='%s-%d' % (prefix, number), **kwargs)
+                        for number in range(1, count + 1)]
+
+    def __enter__(self):
+        for device in self.devices:
+            device.start()
+        return self
+
+    def __exit__(self, *args):
+        for device in self.devices:
+            device.stop()
+
+    def inventory(self, **optional_args):
+        """Returns the run_fleet inventory of the simulated devices."""
+        inventory = list()
+        for device in self.devices:
+            args = dict(optional_args, port=device.port)
+            inventory.append({'hostname': '127.0.0.1', 'username': device.username,
+                              'password': device.password, 'optional_args': args})
+        return inventory
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--devices', type=int, default=1, help='devices to simulate (1)')
+    parser.add_argument('--port', type=int, default=0, help='port of the first device (any)')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds per command (0)')
+    parser.add_argument('--throughput', type=int, default=None, help='bytes per second (none)')
+    parser.add_argument('--channels', type=int, default=1, help='shells per SSH session (1)')
+    args = parser.parse_args(argv)
+
+    simulator = FastIronSimulator(0)
+    for number in range(args.devices):
+        simulator.devices.append(SimulatedDevice(
+            hostname='ICX7250-sim-%d' % (number + 1), latency=args.latency,
+            throughput=args.throughput, max_channels=args.channels,
+            port=args.port + number if args.port else 0))
+    with simulator:
+        for device in simulator.devices:
+            print('%s 127.0.0.1:%d %s/%s' % (device.hostname, device.port, device.username,
+                                             device.password))
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
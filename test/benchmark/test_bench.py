@@ -0,0 +1,43 @@
+"""Checks that the benchmarks run and measure what they should."""
+
+import bench_getters
+import bench_import
+import generators
+
+
+def test_generated_outputs_are_parsed():
+    size = bench_getters.sizes(0.01)
+    data = bench_getters.outputs(size)
+    driver = bench_getters.build_driver(data)
+    ports = size['units'] * size['ports']
+
+    assert len(driver.get_facts()['interface_list']) == ports
+    assert len(driver.get_interfaces()) == ports
+    assert len(driver.get_interfaces_counters()) == ports
+    assert len(driver.get_mac_address_table()) == size['mac']
+    assert len(driver.get_arp_table()) == size['arp']
+    environment = driver.get_environment()
+    assert len(environment['temperature']) == 2 * size['units']
+    assert environment['power']['PS1']['capacity'] == 740.0
+    assert len(driver.get_lldp_neighbors()) == ports
+    detail = driver.get_lldp_neighbors_detail()
+    assert len(detail) == ports
+    assert detail['1/1/1'][0]['remote_system_description'].endswith('08.0.30eT213 compiled on '
+                                                                    'Jun 21 2016')
+    assert len(driver.get_ntp_servers()) == len(driver.get_ntp_stats()) == size['ntp']
+    assert len(driver.get_users()) == size['users']
+    assert '+  port-name link0' in bench_getters._compare_config(driver, data)
+    assert generators.candidate_config('a\n port-name x\n') == ' port-name x-new\n'
+
+
+def test_run_benchmark():
+    rows = bench_getters.run_benchmark([0.001], repeat=1, report=lambda line: None)
+    assert [row[0] for row in rows] == [case[0] for case in bench_getters.CASES]
+    assert all(row[2] > 0 for row in rows)
+
+
+def test_parsers_import_without_transport():
+    modules = [module for module in bench_import.MODULES if 'FastIron' not in module and
+               'fleet' not in module]
+    rows = bench_import.run_benchmark(modules, repeat=1, report=lambda line: None)
+    assert [row[2] for row in rows] == [''] * len(modules)
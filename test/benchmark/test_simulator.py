@@ -0,0 +1,64 @@
+"""Tests for the FastIron simulator."""
+
+import bench_session
+from napalm_ruckus_fastiron import FastIronDriver
+from simulator import FastIronCLI, FastIronSimulator, MORE, sanitize
+
+
+def test_cli_modes():
+    cli = FastIronCLI('sw1', {sanitize('show arp'): 'No.   IP\n1     10.0.0.1\n'})
+    assert cli.prompt() == 'SSH@sw1>'
+    assert cli.execute('enable') == ''
+    assert cli.prompt() == 'Password:'
+    cli.execute('secret')
+    assert cli.prompt() == 'SSH@sw1#'
+    assert cli.execute('show  arp') == 'No.   IP\r\n1     10.0.0.1'
+    assert cli.execute('show foo').startswith('Invalid input -> show foo')
+    assert cli.execute('show arp | include 10.0') == '1     10.0.0.1'
+
+    cli.execute('conf t')
+    assert cli.prompt() == 'SSH@sw1(config)#'
+    cli.execute('hostname sw2')
+    cli.execute('no hostname sw1')
+    cli.execute('interface ethernet 1/1/1')
+    cli.execute('exit')
+    assert cli.prompt() == 'SSH@sw1(config)#'           # left the context, not config mode
+    cli.execute('end')
+    assert cli.execute('show running | i hostname') == 'hostname sw2'
+
+
+def test_cli_paging():
+    cli = FastIronCLI('sw1', {}, page_length=2)
+    assert cli.pages('a\nb\nc') == ['a\r\nb', 'c']
+    assert cli.execute('skip-page-display') == 'Disable page display mode'
+    assert cli.pages('a\nb\nc') == ['a\nb\nc']
+    assert MORE.startswith('--More--')
+
+
+def test_driver_session():
+    with FastIronSimulator(1) as simulator:
+        timings = bench_session.time_session(simulator.devices[0], getters=['get_arp_table'],
+                                             commit=False, report=lambda line: None)
+        commands = simulator.devices[0].commands
+
+    assert [step for step, __ in timings] == ['open', 'get_arp_table', 'close']
+    assert commands.index('enable') < commands.index('skip-page-display')
+    assert commands.index('skip-page-display') < commands.index('show arp')
+
+
+def test_additional_channels():
+    with FastIronSimulator(1, max_channels=2) as simulator:
+        device = simulator.devices[0]
+        driver = FastIronDriver('127.0.0.1', device.username, device.password,
+                                optional_args={'port': device.port, 'channels': 3})
+        driver.open()
+        shells = len(driver._shells)                    # the device refuses the third channel
+        parallel = driver.get_environment()
+        driver._shells, extra = [], driver._shells
+        single = driver.get_environment()
+        driver._shells = extra
+        driver.close()
+
+    assert shells == 1
+    assert parallel == single
+    assert device.commands.count('show chassis') == 2
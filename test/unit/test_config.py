@@ -0,0 +1,116 @@
+"""Tests for the configuration comparison."""
+
+from napalm_ruckus_fastiron.utils.config import compare_configs, config_blocks, parse_config, \
+    replace_commands
+
+RUNNING = """Current configuration:
+!
+ver 08.0.30
+!
+interface ethernet 1/1/1
+ port-name uplink
+ speed-duplex 1000-full
+!
+interface ethernet 1/1/2
+ port-name b
+!
+vlan 10 by port
+ tagged ethe 1/1/1
+ untagged ethe 1/1/2
+!
+end""".splitlines()
+
+CANDIDATE = """!
+ver 08.0.30
+!
+interface ethernet 1/1/1
+ port-name downlink
+ speed-duplex 1000-full
+!
+interface ethernet 1/1/2
+ port-name b
+ disable
+!
+vlan 10 by port
+ tagged ethe 1/1/1
+ untagged ethe 1/1/3
+!
+vlan 20 by port
+ tagged ethe 1/1/1
+!
+end""".splitlines()
+
+
+def test_config_blocks():
+    blocks = config_blocks(RUNNING)
+    assert [block[0] for block in blocks] == ['ver 08.0.30', 'interface ethernet 1/1/1',
+                                              'interface ethernet 1/1/2', 'vlan 10 by port']
+    assert blocks[1] == ['interface ethernet 1/1/1', ' port-name uplink', ' speed-duplex 1000-full']
+    assert config_blocks(['!', 'hostname sw1', '!', '!', 'end']) == [['hostname sw1']]
+
+
+def test_compare_configs():
+    assert compare_configs(RUNNING, CANDIDATE) == "\n".join([
+        "interface ethernet 1/1/1",
+        "-  port-name downlink",
+        "+  port-name uplink",
+        "vlan 10 by port",
+        "-  untagged ethe 1/1/3",
+        "+  untagged ethe 1/1/2",
+        "interface ethernet 1/1/2",
+        "-  disable",
+        "- vlan 20 by port",
+        "-  tagged ethe 1/1/1",
+    ]) + "\n"
+    assert compare_configs(RUNNING, RUNNING) == ""
+
+
+def test_parse_config_nests_contexts():
+    tree = parse_config(['!', 'router bgp', ' local-as 65000', ' address-family ipv4 unicast',
+                         '  network 10.0.0.0/24', ' exit-address-family', '!', 'end'])
+    bgp = tree.get('router bgp')
+    assert list(bgp.children) == ['local-as 65000', 'address-family ipv4 unicast',
+                                  'exit-address-family']
+    assert list(bgp.get('address-family ipv4 unicast').children) == ['network 10.0.0.0/24']
+    assert parse_config(RUNNING).get('vlan 10 by port').get('tagged ethe 1/1/1') is not None
+
+
+def test_replace_commands():
+    assert replace_commands(RUNNING, CANDIDATE) == [
+        'interface ethernet 1/1/1',
+        'port-name downlink',                           # set without negating the old name
+        'exit',
+        'interface ethernet 1/1/2',                     # consecutive contexts are not nested
+        'disable',
+        'exit',
+        'vlan 10 by port',
+        'no untagged ethe 1/1/2',
+        'untagged ethe 1/1/3',
+        'exit',
+        'vlan 20 by port',
+        'tagged ethe 1/1/1',
+        'exit',
+    ]
+    assert replace_commands(CANDIDATE, RUNNING)[0] == 'no vlan 20 by port'   # a single command
+    assert replace_commands(RUNNING, RUNNING) == []
+
+
+def test_replace_commands_nested_and_permanent_contexts():
+    running = ['!', 'interface ethernet 1/1/4', ' port-name x', ' disable', '!', 'router bgp',
+               ' address-family ipv4 unicast', '  network 10.0.0.0/24', '  network 10.0.1.0/24',
+               ' exit-address-family', '!']
+    candidate = ['!', 'router bgp', ' address-family ipv4 unicast', '  network 10.0.0.0/24',
+                 ' exit-address-family', '!']
+    assert replace_commands(running, candidate) == [
+        'interface ethernet 1/1/4', 'no port-name x', 'no disable', 'exit',  # not removable
+        'router bgp', 'address-family ipv4 unicast', 'no network 10.0.1.0/24', 'exit', 'exit',
+    ]
+
+
+def test_replace_commands_matches_contexts_by_identity():
+    running = ['!', 'vlan 10 name users by port', ' untagged ethe 1/1/2', '!']
+    candidate = ['!', 'vlan 10 name staff by port', ' untagged ethe 1/1/2', '!']
+    assert replace_commands(running, candidate) == ['vlan 10 name staff by port', 'exit']
+    candidate = ['!', 'vlan 10 name staff by port', ' untagged ethe 1/1/3', '!']
+    assert replace_commands(running, candidate) == [
+        'vlan 10 name staff by port', 'no untagged ethe 1/1/2', 'untagged ethe 1/1/3', 'exit']
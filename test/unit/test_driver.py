@@ -0,0 +1,337 @@
+"""Tests for driver features that do not fit the getter test cases."""
+
+import os
+import time
+
+import pytest
+
+from napalm.base.exceptions import CommandTimeoutException
+
+from napalm_ruckus_fastiron import FastIron
+
+MOCKED_DATA = os.path.join(os.path.dirname(__file__), 'mocked_data')
+
+
+def _mocked(test, filename, case='normal'):
+    with open(os.path.join(MOCKED_DATA, test, case, filename)) as data_file:
+        return data_file.read()
+
+
+class ScriptedDevice(object):
+    """Netmiko connection double answering from a command -> output dictionary."""
+
+    def __init__(self, outputs):
+        self.outputs = outputs
+        self.sent = []
+
+    def send_command(self, command, **kwargs):
+        self.sent.append(command)
+        return self.outputs.get(command, 'Invalid input -> %s\nType ? for a list\n' % command)
+
+    def config_mode(self):
+        pass
+
+    def send_config_set(self, commands):
+        self.configured = commands
+
+    def disconnect(self):
+        pass
+
+
+@pytest.fixture
+def driver():
+    def build(outputs, optional_args=None):
+        device = FastIron.FastIronDriver('sw1', 'admin', 'admin', optional_args=optional_args)
+        device.device = ScriptedDevice(outputs)
+        return device
+    return build
+
+
+def test_mac_filter_is_pushed_to_device(driver):
+    device = driver({'show mac-address vlan 1': _mocked('test_get_mac_address_table',
+                                                        'show_mac_address_all.text')})
+    entries = device.get_mac_address_table(vlan=1)
+    assert device.device.sent == ['show mac-address vlan 1']
+    assert len(entries) == 4
+
+
+def test_mac_filter_falls_back_to_full_table(driver):
+    device = driver({'show mac-address all': _mocked('test_get_mac_address_table',
+                                                     'show_mac_address_all.text')})
+    entries = device.get_mac_address_table(interface='14', address='00:00:00:38:2F:24')
+    assert device.device.sent == ['show mac-address 0000.0038.2f24', 'show mac-address all']
+    assert [entry['mac'] for entry in entries] == ['0000.0038.2f24']
+
+
+def test_arp_filter(driver):
+    device = driver({'show arp': _mocked('test_get_arp_table', 'show_arp.text')})
+    entries = device.get_arp_table(address='10.176.217.1')
+    assert device.device.sent == ['show arp 10.176.217.1', 'show arp']
+    assert [entry['mac'] for entry in entries] == ['02e0.5267.d5d9']
+
+
+def test_arp_router_layout(driver):
+    device = driver({'show arp': _mocked('test_get_arp_table', 'show_arp.text', 'router')})
+    entries = device.get_arp_table(interface='ve 40')
+    assert entries == [{'interface': 've 40', 'mac': '02e0.5267.d5d9', 'ip': '10.20.40.1',
+                        'age': -1.0}]
+
+
+def test_command_cache(driver):
+    device = driver({'show arp': _mocked('test_get_arp_table', 'show_arp.text')},
+                    optional_args={'cache_ttl': 60})
+    assert device.get_arp_table() == device.get_arp_table()
+    assert device.device.sent == ['show arp']
+    assert device.cache_stats()['hits'] == 1
+    device.clear_cache()
+    device.get_arp_table()
+    assert device.device.sent == ['show arp', 'show arp']
+
+
+def test_platform_is_probed_once(driver):
+    device = driver({'show version': 'HW: Stackable ICX7150-24\nSW: Version 08.0.70T211\n'})
+    assert device.get_network_instances() == {}
+    assert device.get_network_instances(name='mgmt') == {}
+    assert device.device.sent.count('show version') == 1
+    assert device.image_type == 'Router'
+
+
+def test_facts_cache_across_sessions(driver, tmpdir):
+    version = ('SW: Version 08.0.30eT213\nHW: Stackable ICX7250-48P\nSerial  #:DUK3831K0BS\n'
+               'STACKID 1  system uptime is 2 day(s) 3 hour(s)\n')
+    outputs = {
+        'show version': version,
+        'show version | include uptime': version.splitlines()[-1],
+        'show version | include SW:': version.splitlines()[0],
+        'show interface brief': _mocked('test_get_interfaces', 'show_interface_brief.text'),
+        'show running | i hostname': 'hostname sw1',
+    }
+    args = {'facts_cache': str(tmpdir.join('facts.db'))}
+    facts = driver(outputs, optional_args=args).get_facts()
+
+    device = driver(outputs, optional_args=args)       # a later process
+    assert device.get_facts() == facts
+    assert device.platform['model'] == 'ICX7250-48P'
+    assert device.device.sent == ['show version | include uptime', 'show version | include SW:']
+
+    outputs['show version | include uptime'] = 'STACKID 1  system uptime is 5 minute(s)'
+    device = driver(outputs, optional_args=args)       # reloaded, the entry is dropped
+    assert device.get_facts()['uptime'] == 2 * 86400 + 3 * 3600
+    assert 'show interface brief' in device.device.sent
+
+
+def test_instrumentation(driver):
+    events = []
+    device = driver({'show arp': _mocked('test_get_arp_table', 'show_arp.text')},
+                    optional_args={'metrics_hook': events.append})
+    device.get_arp_table()
+    metrics = device.metrics()
+    assert metrics['commands']['show arp']['count'] == 1
+    assert metrics['commands']['show arp']['lines'] > 0
+    getter = metrics['getters']['get_arp_table']
+    assert getter['bytes'] == metrics['commands']['show arp']['bytes']
+    assert getter['wall'] >= getter['parse']
+    assert [(event['type'], event['name']) for event in events] == [
+        ('command', 'show arp'), ('getter', 'get_arp_table')]
+
+
+def test_instrumentation_is_off_by_default(driver):
+    device = driver({'show arp': _mocked('test_get_arp_table', 'show_arp.text')})
+    device.get_arp_table()
+    assert device.metrics() == {'commands': {}, 'getters': {}}
+    assert 'get_arp_table' not in vars(device)
+
+
+class ChannelDevice(ScriptedDevice):
+    """Raw channel double returning the echo, output and prompt of a command in small chunks."""
+
+    RETURN = '\n'
+    base_prompt = 'SSH@sw1'
+
+    def __init__(self, outputs, chunk=16):
+        super(ChannelDevice, self).__init__(outputs)
+        self.chunk = chunk
+        self.pending = []
+
+    def clear_buffer(self):
+        pass
+
+    def write_channel(self, data):
+        command = data.rstrip('\n')
+        self.sent.append(command)
+        text = command + '\r\n' + self.send_command(command).replace('\n', '\r\n') + 'SSH@sw1#'
+        self.sent.pop()
+        self.pending.extend(text[pos:pos + self.chunk] for pos in range(0, len(text), self.chunk))
+
+    def read_channel(self):
+        return self.pending.pop(0) if self.pending else ''
+
+
+def test_streamed_tables(driver):
+    device = driver({}, optional_args={'read_strategy': 'stream', 'instrumentation': True})
+    device.device = ChannelDevice({
+        'show mac-address all': _mocked('test_get_mac_address_table', 'show_mac_address_all.text'),
+        'show arp': _mocked('test_get_arp_table', 'show_arp.text'),
+    })
+    streamed = device.get_arp_table(address='10.176.217.1')
+    assert device.device.sent == ['show arp 10.176.217.1', 'show arp']
+    assert [entry['mac'] for entry in streamed] == ['02e0.5267.d5d9']
+
+    entries = device.iter_mac_address_table()
+    assert next(entries)['mac'] == '0000.0034.1234'
+    entries.close()                                     # the rest of the output is drained
+    assert device.device.pending == []
+    assert len(device.get_mac_address_table()) == 4
+    assert device.metrics()['commands']['show mac-address all']['count'] == 2
+
+
+class SlowChannelDevice(ChannelDevice):
+    """Channel double making every chunk available delay seconds after the previous one, and
+    the stalled-th chunk stall seconds after it."""
+
+    def __init__(self, outputs, delay, stall=0, stalled=None):
+        super(SlowChannelDevice, self).__init__(outputs)
+        self.delay, self.stall, self.stalled = delay, stall, stalled
+        self.chunks = 0
+        self.ready = 0
+
+    def clear_buffer(self):
+        if self.pending and time.time() >= self.ready:
+            self.pending = []
+
+    def write_channel(self, data):
+        super(SlowChannelDevice, self).write_channel(data)
+        self.ready = time.time() + self.delay
+
+    def read_channel(self):
+        if not self.pending or time.time() < self.ready:
+            return ''
+        self.chunks += 1
+        self.ready = time.time() + (self.stall if self.chunks == self.stalled else self.delay)
+        return self.pending.pop(0)
+
+    def normalize_linefeeds(self, text):
+        return text.replace('\r\n', '\n')
+
+    def strip_ansi_escape_codes(self, text):
+        return text
+
+
+def test_prompt_read_waits_while_the_device_sends(driver):
+    device = driver({}, optional_args={'read_strategy': 'prompt'})
+    device.timeout = 0.1
+    device.device = SlowChannelDevice({'show arp': _mocked('test_get_arp_table', 'show_arp.text')},
+                                      delay=0.01)                   # about 0.3s in all
+    assert len(device.get_arp_table()) == 6
+
+
+def test_prompt_read_recovers_after_timeout(driver):
+    device = driver({}, optional_args={'read_strategy': 'prompt'})
+    device.timeout = 0.1
+    device.device = SlowChannelDevice({'show arp': _mocked('test_get_arp_table', 'show_arp.text')},
+                                      delay=0.001, stall=0.15, stalled=3)
+    with pytest.raises(CommandTimeoutException):
+        device.get_arp_table()
+    assert device.device.pending == []                  # drained up to the prompt
+    assert len(device.get_arp_table()) == 6
+
+
+def test_cli_sends_commands_one_at_a_time(driver):
+    device = driver({})
+    device.device = ChannelDevice({'show clock': '10:00:00 GMT+00 Sun Oct 18 2026',
+                                   'show arp': _mocked('test_get_arp_table', 'show_arp.text')})
+    outputs = device.cli(['show clock', 'show arp'])
+    assert device.device.sent == ['show clock', 'show arp']
+    assert device.device.pending == []
+    assert outputs['show clock'] == '10:00:00 GMT+00 Sun Oct 18 2026'
+
+
+class Transport(object):
+    def __init__(self):
+        self.active = True
+
+    def is_active(self):
+        return self.active
+
+
+class RemoteConnection(object):
+    def __init__(self):
+        self.transport = Transport()
+        self.closed = False
+
+
+def test_is_alive_skips_probe_after_recent_command(driver):
+    device = driver({'show arp': _mocked('test_get_arp_table', 'show_arp.text'), chr(0): ''},
+                    optional_args={'alive_threshold': 30})
+    device.device.remote_conn = RemoteConnection()
+    assert device.is_alive() == {'is_alive': True}      # nothing sent yet, probes the CLI
+    device.get_arp_table()
+    assert device.is_alive() == {'is_alive': True}
+    assert device.device.sent == [chr(0), 'show arp']
+
+    device.device.remote_conn.transport.active = False
+    assert device.is_alive() == {'is_alive': False}
+    device.device.remote_conn = None
+    assert device.is_alive() == {'is_alive': False}
+
+
+def test_lldp_neighbors_detail_in_one_command(driver):
+    detail = ('Local port: 1/1/1\n  Neighbor: cc4e.2439.1600, TTL 101 seconds\n'
+              '    + Chassis ID (MAC address): cc4e.2439.1600\n'
+              '    + Port ID (interface name): ethernet1/1/3\n')
+    device = driver({'show lldp neighbors detail': detail,
+                     'show lldp neighbor detail port ethe 1/1/1': detail})
+    assert list(device.get_lldp_neighbors_detail()) == ['1/1/1']
+    assert list(device.get_lldp_neighbors_detail('ethe 1/1/1')) == ['ethe 1/1/1']
+    assert device.device.sent == ['show lldp neighbors detail',
+                                  'show lldp neighbor detail port ethe 1/1/1']
+
+
+def test_get_many_sends_shared_commands_once(driver):
+    outputs = {
+        'show interface brief': _mocked('test_get_interfaces', 'show_interface_brief.text'),
+        'show interface': _mocked('test_get_interfaces', 'show_interface.text'),
+        'show arp': _mocked('test_get_arp_table', 'show_arp.text'),
+    }
+    device = driver(outputs)
+    results = device.get_many(['get_interfaces', 'get_interfaces_counters', 'get_arp_table'])
+    assert device.device.sent == ['show interface brief', 'show interface', 'show arp']
+    assert results['get_interfaces'] == driver(outputs).get_interfaces()
+    assert results['get_interfaces_counters'] == driver(outputs).get_interfaces_counters()
+    assert len(results['get_arp_table']) == len(driver(outputs).get_arp_table())
+    assert device.cache_stats()['enabled'] is False     # outputs are not kept past the call
+
+    with pytest.raises(ValueError):
+        device.get_many(['open'])
+
+
+NTP = """     address         ref clock       st  when  poll reach  delay  offset   disp
+*~172.19.69.1        172.24.38.63      3    25    64  377   1.45  -0.107   0.274
+ ~10.20.30.40        0.0.0.0          16   -    64    0   0.00   0.000  15937.0
+"""
+
+
+def test_ntp_getters_share_one_parse(driver):
+    device = driver({'show ntp associations': NTP})
+    results = device.get_many(['get_ntp_peers', 'get_ntp_servers', 'get_ntp_stats'])
+    assert device.device.sent == ['show ntp associations']
+    assert results['get_ntp_peers'] == {'172.19.69.1': {}, '10.20.30.40': {}}   # last row kept
+    assert results['get_ntp_servers'] == {'172.19.69.1': {}, '10.20.30.40': {}}
+    stats = results['get_ntp_stats']
+    assert [(row['remote'], row['synchronized'], row['when']) for row in stats] == [
+        ('172.19.69.1', True, '25'), ('10.20.30.40', False, '-')]
+    assert stats[0]['reachability'] == 377 and stats[1]['jitter'] == 15937.0
+
+
+def test_replace_reads_running_config_from_device(driver):
+    outputs = {'show running-config': '!\nhostname sw1\n!\nend'}
+    device = driver(outputs, optional_args={'cache_ttl': 60})
+    device.get_config('running')                        # cached for the session
+    outputs['show running-config'] = '!\nhostname sw2\n!\nend'   # changed by another session
+    device.load_replace_candidate(config='!\nhostname sw2\n!\nend')
+    assert device.commit_config() is True
+    assert device.device.configured == []
+
+
+def test_close_without_open():
+    FastIron.FastIronDriver('sw1', 'admin', 'admin').close()
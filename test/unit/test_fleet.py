@@ -0,0 +1,65 @@
+"""Tests for the fleet runner."""
+
+import time
+
+from conftest import FakeFastIronDevice, PatchedFastIronDriver
+
+from napalm_ruckus_fastiron.fleet import run_fleet
+
+
+class SlowFakeFastIronDevice(FakeFastIronDevice):
+    """FastIron device test double answering after a simulated latency."""
+
+    def __init__(self, latency):
+        super(SlowFakeFastIronDevice, self).__init__()
+        self.latency = latency
+        self.current_test = 'test_get_arp_table'
+        self.current_test_case = 'normal'
+
+    def send_command(self, command, **kwargs):
+        time.sleep(self.latency)
+        return super(SlowFakeFastIronDevice, self).send_command(command, **kwargs)
+
+    def disconnect(self):
+        pass
+
+
+class SlowFastIronDriver(PatchedFastIronDriver):
+    """Patched driver whose device latency comes from optional_args."""
+
+    def __init__(self, hostname, username, password, timeout=60, optional_args=None):
+        super(SlowFastIronDriver, self).__init__(hostname, username, password, timeout,
+                                                 optional_args)
+        self.device = SlowFakeFastIronDevice((optional_args or {}).get('latency', 0))
+
+    def open(self):
+        if self.hostname.startswith('down'):
+            raise IOError('Cannot connect to switch: %s' % self.hostname)
+
+
+def _inventory(count, latency):
+    return [{'hostname': 'sw%d' % val, 'optional_args': {'latency': latency}}
+            for val in range(count)]
+
+
+def test_run_fleet_is_concurrent():
+    start = time.time()
+    results = list(run_fleet(_inventory(20, 0.2), ['get_arp_table'], max_workers=20,
+                             driver=SlowFastIronDriver))
+    assert time.time() - start < 2
+    assert sorted(r.hostname for r in results) == sorted('sw%d' % val for val in range(20))
+    assert all(r.ok and len(r.results['get_arp_table']) == 6 for r in results)
+
+
+def test_run_fleet_isolates_errors_and_timeouts():
+    inventory = _inventory(2, 0)
+    inventory.append({'hostname': 'down1'})
+    inventory.append({'hostname': 'hung1', 'device_timeout': 0.5,
+                      'optional_args': {'latency': 2}})
+    results = dict((r.hostname, r) for r in run_fleet(inventory, ['get_arp_table', 'get_users'],
+                                                      driver=SlowFastIronDriver))
+
+    assert results['sw0'].results['get_arp_table'][0]['ip'] == '10.176.217.3'
+    assert 'get_users' in results['sw0'].errors
+    assert 'Cannot connect' in results['down1'].error
+    assert 'Timed out' in results['hung1'].error
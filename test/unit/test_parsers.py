@@ -0,0 +1,36 @@
+"""Tests for the parser registry."""
+
+from napalm_ruckus_fastiron.utils.parsers import first, parse, ParserRegistry
+
+LLDP = """Lcl Port Chassis ID      Port ID         Port Description                System Name
+1/1/1    cc4e.2439.1600  cc4e.2439.1600  GigabitEthernet1/1/1            ICX7250-sw2
+1/1/2    cc4e.2439.1601  1/1/2           ICX7250-sw3
+"""
+USERS = """Username    Password                 Encrypt  Priv  Status    Expire Time
+==============================================================================
+admin       $1$Gz.rUdSx$1tvJHydMBV   enabled  0     enabled   Never
+monitor     $1$Gz.rUdSx$2tvJHydMBV   enabled  5     enabled   Never
+"""
+
+
+def test_registry_versions():
+    registry = ParserRegistry()
+    registry.register('show foo', 'bar', r'bar (?P<value>\d+)', casts={'value': int})
+    registry.register('show foo', 'bar', r'baz (?P<value>\d+)', casts={'value': int},
+                      since=(8, 0, 90))
+    output = 'bar 1\nbaz 2\n'
+    assert registry.parse('show foo', 'bar', output, (8, 0, 30)) == [{'value': 1}]
+    assert registry.parse('sh foo', 'bar', output, (8, 0, 95)) == [{'value': 2}]
+    assert registry.first('show foo', 'bar', output) == {'value': 2}   # newest if unknown
+    assert registry.first('show foo', 'bar', '', (8, 0, 30)) is None
+    assert registry.template('show foo', 'bar').regex is registry.template('show foo', 'bar').regex
+
+
+def test_registered_templates():
+    neighbors = parse('show lldp neighbors', 'neighbor', LLDP)
+    assert [(row['local_port'], row['system_name'], row['port_description'])
+            for row in neighbors] == [('1/1/1', 'ICX7250-sw2', 'GigabitEthernet1/1/1'),
+                                      ('1/1/2', 'ICX7250-sw3', '')]
+    assert [(user['username'], user['priv']) for user in parse('show users', 'user', USERS)] == [
+        ('admin', 0), ('monitor', 5)]
+    assert first('show cpu', 'busy', '7 percent busy, from 3 sec ago') == {'percent': 7.0}
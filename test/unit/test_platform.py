@@ -0,0 +1,38 @@
+"""Tests for the platform probe."""
+
+from napalm_ruckus_fastiron.utils.platform import parse_platform, parse_version
+
+SHOW_VERSION = """  Copyright (c) 1996-2016 Brocade Communications Systems, Inc. \
+All rights reserved.
+    UNIT 1: compiled on Jun 21 2016 at 05:19:47 labeled as SPR08030e
+      (10391580 bytes) from Primary SPR08030e.bin
+        SW: Version 08.0.30eT213
+  HW: Stackable ICX7250-48P
+==========================================================================
+UNIT 1: SL 1: ICX7250-48P POE 48-port Management Module
+         Serial  #:DUK3831K0BS
+==========================================================================
+STACKID 1  system uptime is 2 day(s) 3 hour(s) 29 minute(s) 38 second(s)
+"""
+
+
+def test_parse_version():
+    assert parse_version('08.0.30eT213') == (8, 0, 30)
+    assert parse_version('08.0.61b') > (8, 0, 50)
+    assert parse_version(None) == ()
+
+
+def test_parse_platform():
+    platform = parse_platform(SHOW_VERSION)
+    assert platform['model'] == 'ICX7250-48P'
+    assert platform['os_version'] == '08.0.30eT213'
+    assert platform['serial_number'] == 'DUK3831K0BS'
+    assert platform['image_type'] == 'Router'
+    assert platform['stack_size'] == 1
+    assert platform['vrf_support'] is False             # ICX7250 needs 08.0.50 or later
+
+    newer = parse_platform(SHOW_VERSION.replace('08.0.30eT213', '08.0.61bT213'))
+    assert newer['vrf_support'] is True
+    switch = parse_platform(SHOW_VERSION.replace('SPR08030e', 'SPS08030e'))
+    assert switch['image_type'] == 'Switch'
+    assert switch['vrf_support'] is False
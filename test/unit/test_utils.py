@@ -0,0 +1,183 @@
+"""Tests for the parser utilities."""
+
+import pytest
+
+from napalm_ruckus_fastiron.utils.cache import CommandCache, normalize_command
+from napalm_ruckus_fastiron.utils.channel import assign_commands, CommandProfile, count_prompts, \
+    prompt_pattern, shell_pattern, split_by_prompt
+from napalm_ruckus_fastiron.utils.lines import iter_nlines, list_of_nlines
+from napalm_ruckus_fastiron.utils.lldp import parse_lldp_neighbors
+from napalm_ruckus_fastiron.utils.tables import iter_mac_entries, MacEntry
+from napalm_ruckus_fastiron.utils.tokens import TokenizedOutput
+
+LLDP_DETAIL = """Local port: 1/1/1
+  Neighbor: cc4e.2439.1600, TTL 101 seconds
+    + Chassis ID (MAC address): cc4e.2439.1600
+    + Port ID (interface name): ethernet1/1/3
+    + Time to live: 120 seconds
+    + System name         : "ICX7250-sw2"
+    + Port description    : "GigabitEthernet1/1/3"
+    + System description  : "Ruckus Wireless, Inc. ICX7250-48P, IronWare Version 08.0.3\\
+                             0eT213 compiled on Jun 21 2016"
+    + System capabilities : bridge, router
+      Enabled capabilities: bridge
+    + Management address (IPv4): 10.0.0.2
+    + Link aggregation: not capable
+
+Local port: 1/1/2
+  Neighbor: cc4e.2439.1700, TTL 98 seconds
+    + Chassis ID (MAC address): cc4e.2439.1700
+    + Port ID (MAC address): cc4e.2439.1701
+    + System name         : "ICX7150-sw3"
+"""
+
+
+def test_nlines_skips_blank_lines():
+    output = "\n\nPort   Link\n\n1/1/1  Up\n  \n1/1/2  Down\n"
+    expected = ["Port   Link", "1/1/1  Up", "  ", "1/1/2  Down"]
+    assert list_of_nlines(output) == expected
+    assert list(iter_nlines(output)) == expected
+
+
+def test_nlines_keeps_last_line():
+    output = "hostname sw1\nend"
+    assert list_of_nlines(output) == ["hostname sw1", "end"]
+    assert list(iter_nlines(output)) == ["hostname sw1", "end"]
+
+
+def test_nlines_is_lazy():
+    lines = iter_nlines("a\nb\nc")
+    assert next(lines) == "a"
+    assert list(lines) == ["b", "c"]
+    assert list(iter_nlines("")) == []
+
+
+def test_tokenized_output_offsets():
+    tokens = TokenizedOutput("Fan 1 ok, speed (auto): [[1]]<->2\nFan 2 failed\n")
+    assert "Fan" in tokens
+    assert "Fanless" not in tokens
+    assert tokens.positions("Fan") == [0, 6]
+    assert tokens.values_at("Fan", 2) == ["ok,", "failed"]
+    assert tokens.value_at("Fan", 1) == "1"
+    assert tokens.value_at("PSU", 1) is None
+    assert TokenizedOutput.of(tokens) is tokens
+
+
+def test_normalize_command():
+    assert normalize_command('show int  brief') == 'show interface brief'
+    assert normalize_command('sh running |  i  hostname') == 'show running-config | i hostname'
+
+
+def test_command_cache_hits_and_invalidation():
+    cache = CommandCache(ttl=60)
+    assert cache.get('show version') is None
+    cache.put('show version', 'SW: Version 08.0.30')
+    assert cache.get('sh version') == 'SW: Version 08.0.30'
+    cache.invalidate()
+    assert cache.get('show version') is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 0)
+
+
+def test_command_cache_disabled_and_expired():
+    cache = CommandCache(ttl=0)
+    cache.put('show version', 'output')
+    assert cache.get('show version') is None
+    assert cache.stats()['misses'] == 0
+
+    cache = CommandCache(ttl=60)
+    cache.put('show version', 'output')
+    cache._entries['show version'] = (0, 'output')
+    assert cache.get('show version') is None
+
+
+def test_split_by_prompt():
+    pattern = prompt_pattern('SSH@ICX7250')
+    output = ("show cpu\n1 percent busy\nSSH@ICX7250#show memory\n"
+              "Dynamic memory: 1 bytes total\n\nSSH@ICX7250#")
+    assert count_prompts(pattern, output) == (2, len(output))
+    assert split_by_prompt(output, ['show cpu', 'show memory'], pattern) == [
+        '1 percent busy', 'Dynamic memory: 1 bytes total']
+
+
+def test_prompt_pattern_variants():
+    pattern = prompt_pattern('SSH@ICX7250')
+    assert pattern.search('x\nSSH@ICX7250>')
+    assert pattern.search('x\nSSH@ICX7250(config-vlan-10)#')
+    assert not pattern.search('hostname SSH@ICX7250')
+    with pytest.raises(ValueError):
+        split_by_prompt('show cpu\n1 percent busy', ['show cpu'], pattern)
+
+
+def test_iter_mac_entries_compact():
+    lines = iter([
+        "Total active entries from all ports = 1",
+        "  MAC-Address    Port     Type   VLAN\tAction",
+        "0000.0034.1234     15   Static      1\tforward",
+        "0000.0038.2f00   1/1/3  Dynamic     10\tblock",
+    ])
+    entries = iter_mac_entries(lines, compact=True)
+    first = next(entries)
+    assert isinstance(first, MacEntry)
+    assert (first.mac, first.interface, first.vlan, first.static, first.active) == (
+        '0000.0034.1234', '15', 1, True, True)
+    assert next(entries).to_dict() == {'mac': '0000.0038.2f00', 'interface': '1/1/3', 'vlan': 10,
+                                       'static': False, 'active': False, 'moves': -1,
+                                       'last_move': -1.0}
+    assert list(entries) == []
+
+
+def test_iter_mac_entries_string_vlan():
+    lines = [
+        "  MAC-Address    Port     Type   Action",
+        "0000.0038.2f00   1/1/3  Dynamic  forward",
+    ]
+    assert [entry['vlan'] for entry in iter_mac_entries(lines, vlan='10')] == [10]
+    assert list(iter_mac_entries(lines, vlan='10')) == list(iter_mac_entries(lines, vlan=10))
+
+
+def test_command_profile_grows_timeout_of_large_outputs():
+    profile = CommandProfile(large_output=1000, growth=2.0)
+    profile.record('show version', 0.5, 800)
+    profile.record('show running-config', 30.0, 5000000)
+    profile.record('show run', 10.0, 4000000)
+    assert profile.read_timeout('show version', 60) == 60
+    assert profile.read_timeout('show mac-address all', 60) == 60
+    assert profile.read_timeout('show running-config', 60) == 60
+    assert profile.read_timeout('show running-config', 10) == 60.0
+    timings = profile.timings()['show running-config']
+    assert (timings['count'], timings['mean'], timings['last'], timings['max']) == (
+        2, 20.0, 10.0, 30.0)
+
+
+def test_parse_lldp_neighbors():
+    neighbors = parse_lldp_neighbors(LLDP_DETAIL)
+    assert sorted(neighbors) == ['1/1/1', '1/1/2']
+    assert neighbors['1/1/1'] == [{
+        'parent_interface': '',
+        'remote_chassis_id': 'cc4e.2439.1600',
+        'remote_port': 'ethernet1/1/3',
+        'remote_port_description': 'GigabitEthernet1/1/3',
+        'remote_system_name': 'ICX7250-sw2',
+        'remote_system_description': 'Ruckus Wireless, Inc. ICX7250-48P, IronWare Version '
+                                     '08.0.30eT213 compiled on Jun 21 2016',
+        'remote_system_capab': ['bridge', 'router'],
+        'remote_system_enable_capab': ['bridge'],
+    }]
+    assert neighbors['1/1/2'][0]['remote_port'] == 'cc4e.2439.1701'
+    assert neighbors['1/1/2'][0]['remote_system_capab'] == []
+    assert parse_lldp_neighbors(iter_nlines(LLDP_DETAIL)) == neighbors
+    assert parse_lldp_neighbors('No neighbors\n') == {}
+
+
+def test_assign_commands_balances_expected_time():
+    commands = ['show running-config', 'show cpu', 'show memory', 'show chassis']
+    assert assign_commands(commands, [5.0, 0.1, 0.1, 0.2], 2) == [[0], [1, 2, 3]]
+    assert assign_commands(commands, [0.0] * 4, 3) == [[0, 3], [1], [2]]
+
+
+def test_shell_pattern():
+    pattern = shell_pattern('SSH@sw1')
+    assert pattern.search('\nSSH@sw1>').group('mode') == '>'
+    assert pattern.search('enable\nPassword:').group('login') == 'Password'
+    assert pattern.search('SSH@sw1>enable') is None